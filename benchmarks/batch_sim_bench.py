@@ -0,0 +1,88 @@
+import argparse
+import os
+import time
+import numpy as np
+import pygame
+from lib.batch_sim import BatchSimulator
+from lib.game_state import create_placeholder_bird_frames
+from lib.rotation_atlas import RotationAtlas
+
+ASSET_PATH = os.path.join("assets", "images")
+
+def load_bird_frames():
+    frames = []
+
+    for i in range(1, 4):
+        try:
+            frames.append(pygame.transform.scale(pygame.image.load(os.path.join(ASSET_PATH, f"bird{i}.png")), (50, 35)))
+        except FileNotFoundError:
+            print("Failed to load bird image animation")
+
+    return frames or create_placeholder_bird_frames(pygame)
+
+def create_players(games, aim_error, reaction_steps, seed):
+    rng = np.random.default_rng(seed)
+
+    # Each simulated player has their own accuracy; the error they aim with is
+    # redrawn every time they react
+    skill = rng.gamma(4.0, aim_error / 4.0, size = games)
+    offset = np.zeros(games)
+
+    def policy(sim):
+        nonlocal offset
+
+        if sim.frame % reaction_steps == 0:
+            offset = rng.normal(0.0, 1.0, size = games) * skill
+
+        return sim.next_gap() + offset
+
+    return policy
+
+def main():
+    parser = argparse.ArgumentParser(description = "Simulate many games at once and report score distributions")
+    parser.add_argument("--games", type = int, default = 10000)
+    parser.add_argument("--max-steps", type = int, default = 7200)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--aim-error", type = float, default = 80.0, help = "Mean aim error of the simulated players in pixels")
+    parser.add_argument("--reaction-steps", type = int, default = 20)
+    parser.add_argument("--spawn-interval", type = int, nargs = "+", default = [2500])
+    parser.add_argument("--gap-size", type = int, nargs = "+", default = [200])
+    parser.add_argument("--pipe-speed", type = float, nargs = "+", default = [180], help = "Pipe scroll speed in pixels per second")
+    parser.add_argument("--pipe-min-y", type = int, default = 320)
+    parser.add_argument("--pipe-max-y", type = int, default = 860)
+    args = parser.parse_args()
+
+    atlas = RotationAtlas(load_bird_frames(), pygame)
+
+    print(f"{'interval':>8} {'gap':>5} {'speed':>6} {'steps/s':>12} {'mean':>7} {'p50':>5} {'p90':>5} {'p99':>5} {'zero':>6}")
+
+    for spawn_interval in args.spawn_interval:
+        for gap_size in args.gap_size:
+            for pipe_speed in args.pipe_speed:
+                sim = BatchSimulator(
+                    args.games,
+                    seed = args.seed,
+                    pipe_min_y = args.pipe_min_y,
+                    pipe_max_y = args.pipe_max_y,
+                    pipe_spawn_interval = spawn_interval,
+                    gap_size = gap_size,
+                    pipe_speed = pipe_speed,
+                    atlas = atlas
+                )
+                policy = create_players(args.games, args.aim_error, args.reaction_steps, args.seed)
+
+                start = time.perf_counter()
+                scores = sim.run(policy, args.max_steps)
+                elapsed = time.perf_counter() - start
+
+                game_steps = int(sim.steps_alive.sum())
+                p50, p90, p99 = np.percentile(scores, [50, 90, 99])
+                zero_rate = float((scores == 0).mean()) * 100
+
+                print(
+                    f"{spawn_interval:>8} {gap_size:>5} {pipe_speed:>6.0f} {game_steps / elapsed:>12,.0f} "
+                    f"{scores.mean():>7.2f} {p50:>5.0f} {p90:>5.0f} {p99:>5.0f} {zero_rate:>5.1f}%"
+                )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import random
+import time
+import pygame
+from lib.bird import Bird
+from lib.pipe import PipePool
+from lib.collision import CollisionEngine
+from lib.rotation_atlas import RotationAtlas
+
+SCREEN_WIDTH = 1920
+SCREEN_HEIGHT = 1080
+ITERATIONS = 2000
+
+def legacy_collide(pipe, bird):
+    bird_mask = bird.get_mask()
+    bird_x, bird_y = bird.get_mask_position()
+
+    top_mask = pygame.mask.Mask((pipe.pipe_width, pipe.pipe_height))
+    top_mask.fill()
+
+    bottom_mask = pygame.mask.Mask((pipe.pipe_width, pipe.pipe_height))
+    bottom_mask.fill()
+
+    top_offset = (pipe.x - bird_x, pipe.top_y - bird_y)
+    bottom_offset = (pipe.x - bird_x, pipe.bottom_y - bird_y)
+
+    return bird_mask.overlap(top_mask, top_offset) or bird_mask.overlap(bottom_mask, bottom_offset)
+
+def create_bird_frames():
+    frame = pygame.Surface((50, 35), pygame.SRCALPHA)
+    pygame.draw.ellipse(frame, (255, 255, 0), (0, 0, 50, 35))
+
+    return [frame]
+
+def create_scenes(rng, count):
+    frames = create_bird_frames()
+    atlas = RotationAtlas(frames, pygame)
+    scenes = []
+
+    for _ in range(count):
+        bird = Bird(100, rng.randint(0, SCREEN_HEIGHT), frames, pygame, atlas)
+        bird.angle = rng.uniform(-30, 30)
+        pipes = PipePool(pygame, SCREEN_HEIGHT)
+        x = rng.randint(-80, 400)
+
+        while x < SCREEN_WIDTH:
+            pipes.spawn(x, rng.randint(320, 860))
+            x += rng.randint(150, 500)
+
+        scenes.append((bird, pipes))
+
+    return scenes
+
+def run(seed = 0):
+    rng = random.Random(seed)
+    scenes = create_scenes(rng, ITERATIONS)
+    engine = CollisionEngine(pygame)
+
+    start = time.perf_counter()
+    legacy_results = [any(legacy_collide(pipe, bird) for pipe in pipes) for bird, pipes in scenes]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine_results = [engine.collide_any(bird, pipes) is not None for bird, pipes in scenes]
+    engine_time = time.perf_counter() - start
+
+    mismatches = sum(1 for legacy, result in zip(legacy_results, engine_results) if bool(legacy) != result)
+
+    print(f"Scenes: {ITERATIONS}, collisions: {sum(engine_results)}, mismatches: {mismatches}")
+    print(f"Legacy masks: {legacy_time * 1000:.2f} ms ({legacy_time / ITERATIONS * 1e6:.1f} us/frame)")
+    print(f"Collision engine: {engine_time * 1000:.2f} ms ({engine_time / ITERATIONS * 1e6:.1f} us/frame)")
+    print(f"Speedup: {legacy_time / engine_time:.1f}x")
+
+    return mismatches == 0
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,92 @@
+import argparse
+import os
+import time
+import numpy as np
+from lib.webcam import Webcam
+from lib.detectors import list_backends
+from lib.recording import open_capture
+
+MODEL_PATH = os.path.join("assets", "models", "haarcascade_frontalface_alt.xml")
+
+def load_frames(video_path, max_frames):
+    capture = open_capture(video_path)
+    frames = []
+
+    while len(frames) < max_frames:
+        ret, frame = capture.read()
+
+        if not ret:
+            break
+
+        frames.append(frame)
+
+    capture.release()
+    return frames
+
+def run_mode(frames, backend, mode, scale):
+    webcam = Webcam(MODEL_PATH, 1920, 1080, detection_mode = mode, detection_scale = scale, detector_backend = backend)
+
+    if webcam.detector is None:
+        return None
+
+    timings = []
+    hits = 0
+
+    for frame in frames:
+        start = time.perf_counter()
+        webcam._detect_face(frame)
+        timings.append(time.perf_counter() - start)
+        hits += int(webcam.has_valid_face)
+
+    timings = np.array(timings) * 1000
+
+    return {
+        "backend": backend,
+        "mode": mode,
+        "mean_ms": float(timings.mean()),
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p99_ms": float(np.percentile(timings, 99)),
+        "fps": float(1000 / timings.mean()),
+        "hit_rate": hits / len(frames)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compare face detector backends and detection modes on recorded footage")
+    parser.add_argument("video", help = "Path to a video file or a recording made with --record")
+    parser.add_argument("--max-frames", type = int, default = 600)
+    parser.add_argument("--scale", type = float, default = 0.5)
+    parser.add_argument("--backends", nargs = "+", default = ["haar:frontalface_alt"], help = "Backends to compare, or 'all' for every known backend")
+    parser.add_argument("--modes", nargs = "+", default = ["full", "tracking"], choices = ["full", "tracking"])
+    args = parser.parse_args()
+    backends = list_backends() if args.backends == ["all"] else args.backends
+
+    frames = load_frames(args.video, args.max_frames)
+
+    if not frames:
+        print(f"No frames could be read from {args.video}")
+        return
+
+    print(f"Frames: {len(frames)} ({frames[0].shape[1]}x{frames[0].shape[0]})")
+
+    results = []
+
+    for backend in backends:
+        for mode in args.modes:
+            result = run_mode(frames, backend, mode, args.scale)
+
+            if result is None:
+                print(f"Skipping {backend}: detector could not be loaded")
+                break
+
+            results.append(result)
+
+    print(f"{'backend':<32} {'mode':<9} {'fps':>8} {'p50 ms':>8} {'p99 ms':>8} {'hit rate':>9}")
+
+    for result in results:
+        print(
+            f"{result['backend']:<32} {result['mode']:<9} {result['fps']:>8.1f} {result['p50_ms']:>8.2f} "
+            f"{result['p99_ms']:>8.2f} {result['hit_rate'] * 100:>8.1f}%"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import argparse
+import bisect
+import os
+import time
+import cv2
+import numpy as np
+import pygame
+from lib.bird import Bird
+from lib.game_state import create_placeholder_bird_frames
+from lib.detectors import load_detector
+from lib.face_finder import FaceFinder
+from lib.recording import ReplayCapture, is_recording, open_capture
+from lib.webcam import Webcam
+
+MODEL_PATH = os.path.join("assets", "models", "haarcascade_frontalface_alt.xml")
+SCREEN_HEIGHT = 1080
+TICK = 1 / 60
+
+def load_footage(path, max_frames):
+    capture = open_capture(path)
+    frames = []
+
+    while len(frames) < max_frames:
+        ret, frame = capture.read()
+
+        if not ret:
+            break
+
+        frames.append(frame)
+
+    # Recordings carry their capture times; plain videos are assumed to be evenly paced
+    if isinstance(capture, ReplayCapture):
+        timestamps = capture.index["timestamp"][:len(frames)] - capture.index["timestamp"][0]
+    else:
+        fps = capture.get(cv2.CAP_PROP_FPS) or 30
+        timestamps = np.arange(len(frames)) / fps
+
+    capture.release()
+    return frames, np.asarray(timestamps, dtype = float)
+
+def reference_track(frames, timestamps, backend):
+    # Full-frame detection on every frame, unsmoothed, is the best available
+    # estimate of where the head actually was when each frame was captured
+    finder = FaceFinder(load_detector(MODEL_PATH, backend), detection_mode = "full", color_order = "BGR")
+    times = []
+    centers = []
+
+    for frame, timestamp in zip(frames, timestamps):
+        faces = finder.find(frame)
+
+        if faces:
+            x, y, w, h, _ = max(faces, key = lambda face: face[2] * face[3])
+            times.append(timestamp)
+            centers.append(y + h / 2)
+
+    return np.array(times), np.array(centers)
+
+def simulate(frames, timestamps, backend, face_tracking):
+    webcam = Webcam(MODEL_PATH, 1920, SCREEN_HEIGHT, detector_backend = backend, face_tracking = face_tracking)
+    bird = Bird(100, SCREEN_HEIGHT // 2, create_placeholder_bird_frames(pygame), pygame)
+    frame_height = frames[0].shape[0]
+    tick_times = np.arange(0.0, timestamps[-1], TICK)
+    centroid_y = np.empty(len(tick_times))
+    bird_y = np.empty(len(tick_times))
+
+    # Detection runs on a virtual clock: it takes the newest captured frame once it
+    # is free and its result lands after the measured detection time
+    free_at = 0.0
+    last_index = -1
+    pending = None
+
+    for i, now in enumerate(tick_times):
+        while True:
+            if pending is not None:
+                done_at, index, faces = pending
+
+                if done_at > now:
+                    break
+
+                webcam.face_finder.report(faces)
+                webcam._apply_faces(faces, index, timestamps[index])
+                free_at = done_at
+                pending = None
+
+            if last_index + 1 >= len(frames):
+                break
+
+            start = max(free_at, timestamps[last_index + 1])
+
+            if start > now:
+                break
+
+            index = bisect.bisect_right(timestamps, start) - 1
+            detect_start = time.perf_counter()
+            faces = webcam.face_finder.find(frames[index], webcam.face_finder.plan_roi(webcam.smoothed_face))
+            pending = (start + time.perf_counter() - detect_start, index, faces)
+            last_index = index
+
+        center_y = webcam.get_centroid(now)[1] / frame_height * SCREEN_HEIGHT
+        bird.set_position(int(max(0, min(center_y, SCREEN_HEIGHT))))
+        bird.update(TICK)
+        centroid_y[i] = center_y
+        bird_y[i] = bird.y
+
+    return tick_times, centroid_y, bird_y
+
+def estimate_lag(tick_times, series, reference_times, reference, max_lag = 0.6):
+    # The lag is the delay that best lines the series up with the reference track
+    best = (float("inf"), 0.0)
+    settled = tick_times > 0.5
+
+    for lag in np.arange(0.0, max_lag, 0.005):
+        shifted = tick_times[settled] - lag
+        valid = (shifted >= reference_times[0]) & (shifted <= reference_times[-1])
+
+        if valid.sum() < 10:
+            continue
+
+        expected = np.interp(shifted[valid], reference_times, reference)
+        error = float(np.mean(np.abs(series[settled][valid] - expected)))
+        best = min(best, (error, lag))
+
+    return best[1] * 1000, best[0]
+
+def main():
+    parser = argparse.ArgumentParser(description = "Measure head-to-bird latency on recorded footage")
+    parser.add_argument("video", help = "Path to a recording made with --record, or a video file")
+    parser.add_argument("--max-frames", type = int, default = 900)
+    parser.add_argument("--backend", default = None)
+    parser.add_argument("--trackers", nargs = "+", default = ["average", "predictive"], choices = ["average", "predictive"])
+    args = parser.parse_args()
+
+    frames, timestamps = load_footage(args.video, args.max_frames)
+
+    if len(frames) < 2:
+        print(f"Not enough frames could be read from {args.video}")
+        return
+
+    if not is_recording(args.video):
+        print("Plain video: assuming evenly spaced capture times")
+
+    reference_times, reference = reference_track(frames, timestamps, args.backend)
+
+    if len(reference) < 2:
+        print("No face found in the footage")
+        return
+
+    reference = reference / frames[0].shape[0] * SCREEN_HEIGHT
+
+    print(f"Frames: {len(frames)}, reference detections: {len(reference)}")
+    print(f"{'tracker':<12} {'centroid lag ms':>16} {'centroid err px':>16} {'bird lag ms':>12} {'bird err px':>12}")
+
+    for face_tracking in args.trackers:
+        tick_times, centroid_y, bird_y = simulate(frames, timestamps, args.backend, face_tracking)
+        centroid_lag, centroid_error = estimate_lag(tick_times, centroid_y, reference_times, reference)
+        bird_lag, bird_error = estimate_lag(tick_times, bird_y, reference_times, reference)
+
+        print(f"{face_tracking:<12} {centroid_lag:>16.0f} {centroid_error:>16.1f} {bird_lag:>12.0f} {bird_error:>12.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import os
+import time
+import numpy as np
+import pygame
+from lib.detectors import load_detector
+from lib.face_finder import FaceFinder
+from lib.opencl import resolve_opencl
+from lib.recording import open_capture
+from lib.webcam import Webcam
+
+MODEL_PATH = os.path.join("assets", "models", "haarcascade_frontalface_alt.xml")
+
+def load_frames(video_path, max_frames):
+    capture = open_capture(video_path)
+    frames = []
+
+    while len(frames) < max_frames:
+        ret, frame = capture.read()
+
+        if not ret:
+            break
+
+        frames.append(frame)
+
+    capture.release()
+    return frames
+
+def run_background(frames, use_umat):
+    webcam = Webcam(MODEL_PATH, 1920, 1080, pygame = pygame, opencl = "off")
+    webcam.use_opencl = use_umat
+    webcam._allocate_frame_buffers(frames[0].shape)
+    timings = []
+    outputs = []
+
+    for frame in frames:
+        start = time.perf_counter()
+        webcam._convert_background(frame)
+        timings.append(time.perf_counter() - start)
+        outputs.append(webcam.background_buffer[::8, ::8].copy())
+
+    return np.array(timings) * 1000, outputs
+
+def run_detection(frames, use_umat, mode, backend):
+    finder = FaceFinder(load_detector(MODEL_PATH, backend), detection_mode = mode, color_order = "BGR", use_umat = use_umat)
+    timings = []
+    results = []
+    face = None
+
+    for frame in frames:
+        start = time.perf_counter()
+        faces = finder.find(frame, finder.plan_roi(face))
+        timings.append(time.perf_counter() - start)
+        finder.report(faces)
+        results.append(faces)
+
+        if faces:
+            face = max(faces, key = lambda found: found[2] * found[3])[:4]
+
+    return np.array(timings) * 1000, results
+
+def main():
+    parser = argparse.ArgumentParser(description = "Compare the numpy and cv2.UMat (OpenCL) webcam paths on recorded footage")
+    parser.add_argument("video", help = "Path to a video file or a recording made with --record")
+    parser.add_argument("--max-frames", type = int, default = 300)
+    parser.add_argument("--backend", default = None)
+    parser.add_argument("--modes", nargs = "+", default = ["full", "tracking"], choices = ["full", "tracking"])
+    parser.add_argument("--opencl", default = "auto", choices = ["auto", "on", "off"])
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.max_frames)
+
+    if not frames:
+        print(f"No frames could be read from {args.video}")
+        return
+
+    # Without a device the UMat path still runs, on OpenCV's CPU fallback, so the
+    # comparison doubles as a check that both paths give the same results
+    if not resolve_opencl(args.opencl):
+        print("OpenCL not in use: the UMat path runs on the CPU fallback")
+
+    print(f"Frames: {len(frames)} at {frames[0].shape[1]}x{frames[0].shape[0]}")
+    print(f"{'stage':<20} {'numpy ms':>9} {'umat ms':>9} {'speedup':>8}  agreement")
+
+    numpy_timings, numpy_outputs = run_background(frames, False)
+    umat_timings, umat_outputs = run_background(frames, True)
+    max_difference = max(int(np.abs(a.astype(int) - b.astype(int)).max()) for a, b in zip(numpy_outputs, umat_outputs))
+    print(f"{'background':<20} {numpy_timings.mean():>9.2f} {umat_timings.mean():>9.2f} {numpy_timings.mean() / umat_timings.mean():>7.2f}x  max pixel difference {max_difference}")
+
+    for mode in args.modes:
+        numpy_timings, numpy_results = run_detection(frames, False, mode, args.backend)
+        umat_timings, umat_results = run_detection(frames, True, mode, args.backend)
+        same = sum(1 for a, b in zip(numpy_results, umat_results) if len(a) == len(b))
+        print(f"{'detect ' + mode:<20} {numpy_timings.mean():>9.2f} {umat_timings.mean():>9.2f} {numpy_timings.mean() / umat_timings.mean():>7.2f}x  same face count on {same / len(frames):.0%} of frames")
+
+if __name__ == "__main__":
+    main()
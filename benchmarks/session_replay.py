@@ -0,0 +1,123 @@
+import argparse
+import glob
+import os
+import random
+import tempfile
+import time
+import pygame
+from benchmarks.simulation_bench import scripted_inputs
+from lib.game_state import GameState, create_placeholder_bird_frames
+from lib.rotation_atlas import RotationAtlas
+from lib.session import Session, SessionRecorder, replay_session
+
+ASSET_PATH = os.path.join("assets", "images")
+BIRD_ANGLE_STEP = 2
+
+def load_bird_frames():
+    # The bird sprites exactly as the game loads them
+    frames = []
+
+    for i in range(1, 4):
+        try:
+            frames.append(pygame.transform.scale(pygame.image.load(os.path.join(ASSET_PATH, f"bird{i}.png")), (50, 35)))
+        except FileNotFoundError:
+            print("Failed to load bird image animation")
+
+    return frames
+
+def find_sessions(paths):
+    sessions = []
+
+    for path in paths:
+        if os.path.isdir(path):
+            sessions.extend(sorted(glob.glob(os.path.join(path, "*.fcs"))))
+        else:
+            sessions.append(path)
+
+    return sessions
+
+def check_recorded_sessions(games, max_steps, seed, frames, atlas):
+    # Records scripted games with the real sprites, as live games are, and checks
+    # every one of them replays to the same result headlessly
+    rng = random.Random(seed)
+    failed = 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        for i in range(games):
+            game = GameState(pygame, seed = seed + i, bird_frames = frames, bird_atlas = atlas)
+            game.recorder = SessionRecorder(game)
+            game.run(scripted_inputs(rng, max_steps), max_steps)
+            path = os.path.join(directory, f"check_{i}.fcs")
+            game.recorder.save(path, game)
+
+            replayed, verified = replay_session(Session(path), pygame, bird_frames = frames, bird_atlas = atlas)
+
+            if not verified:
+                failed += 1
+                print(f"Check game {i}: recorded {game.scores} in {game.frame} steps, replayed {replayed.scores} in {replayed.frame} steps")
+
+    print(f"Check: {games - failed} of {games} sessions recorded with the bird sprites verified")
+
+    return failed == 0
+
+def main():
+    parser = argparse.ArgumentParser(description = "Replay saved game sessions headlessly and verify their scores")
+    parser.add_argument("paths", nargs = "*", help = "Session files, or directories of .fcs files")
+    parser.add_argument("--quiet", action = "store_true", help = "Only print the summary")
+    parser.add_argument("--check", type = int, default = 0, metavar = "GAMES", help = "First record this many scripted games with the bird sprites and check they verify")
+    parser.add_argument("--check-steps", type = int, default = 20000)
+    parser.add_argument("--seed", type = int, default = 0)
+    args = parser.parse_args()
+
+    # Birds collide with the masks of the sprites they are drawn with, so sessions
+    # only replay exactly with the same sprites and angle step as the game
+    frames = load_bird_frames()
+
+    if not frames:
+        print("Bird sprites could not be loaded, replaying with the placeholder bird")
+        frames = create_placeholder_bird_frames(pygame)
+
+    atlas = RotationAtlas(frames, pygame, BIRD_ANGLE_STEP)
+
+    if args.check > 0 and not check_recorded_sessions(args.check, args.check_steps, args.seed, frames, atlas):
+        raise SystemExit(1)
+
+    if not args.paths:
+        return
+
+    paths = find_sessions(args.paths)
+    verified_count = 0
+    total_steps = 0
+    best = None
+    start = time.perf_counter()
+
+    for path in paths:
+        try:
+            session = Session(path)
+        except (OSError, ValueError, IndexError) as e:
+            print(f"{path}: unreadable ({e})")
+            continue
+
+        game, verified = replay_session(session, pygame, bird_frames = frames, bird_atlas = atlas)
+        verified_count += int(verified)
+        total_steps += session.steps
+
+        if verified and (best is None or session.score > best[0]):
+            best = (session.score, path)
+
+        if not args.quiet:
+            status = "verified" if verified else f"MISMATCH (replayed {game.scores} in {game.frame} steps)"
+            print(f"{path}: scores {session.scores}, {session.steps} steps, {status}")
+
+    elapsed = time.perf_counter() - start
+
+    print(f"Sessions: {len(paths)}, verified: {verified_count}, replayed steps: {total_steps}, elapsed: {elapsed:.2f} s")
+
+    if elapsed > 0:
+        print(f"Replay speed: {total_steps / elapsed / 60:,.1f}x real time at 60 FPS")
+
+    if best is not None:
+        print(f"Best verified score: {best[0]} ({best[1]})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import random
+import time
+import pygame
+from lib.game_state import GameState
+
+def scripted_inputs(rng, steps, screen_height = 1080):
+    # A player who drifts toward a new random height every half second
+    target_y = screen_height // 2
+
+    for step in range(steps):
+        if step % 30 == 0:
+            target_y = rng.randint(200, screen_height - 200)
+
+        yield target_y
+
+def main():
+    parser = argparse.ArgumentParser(description = "Measure headless game logic throughput")
+    parser.add_argument("--games", type = int, default = 200)
+    parser.add_argument("--max-steps", type = int, default = 3600)
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--players", type = int, default = 1)
+    args = parser.parse_args()
+
+    game = GameState(pygame, seed = args.seed, players = args.players)
+    rng = random.Random(args.seed)
+    total_steps = 0
+    scores = []
+    start = time.perf_counter()
+
+    for i in range(args.games):
+        game.reset(args.seed + i)
+
+        if args.players == 1:
+            inputs = scripted_inputs(rng, args.max_steps)
+        else:
+            inputs = zip(*(scripted_inputs(rng, args.max_steps) for _ in range(args.players)))
+
+        scores.append(game.run(inputs, args.max_steps))
+        total_steps += game.frame
+
+    elapsed = time.perf_counter() - start
+
+    print(f"Games: {args.games}, simulated frames: {total_steps}, elapsed: {elapsed:.2f} s")
+    print(f"Throughput: {total_steps / elapsed:,.0f} frames/s ({total_steps / elapsed / 60:,.1f}x real time at 60 FPS)")
+    print(f"Score mean: {sum(scores) / len(scores):.2f}, max: {max(scores)}")
+
+if __name__ == "__main__":
+    main()
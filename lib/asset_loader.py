@@ -0,0 +1,113 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class AssetLoader:
+    def __init__(self, pygame, cache_dir = os.path.join(".cache", "assets"), workers = 4):
+        self.pygame = pygame
+        self.cache_dir = cache_dir
+        self.executor = ThreadPoolExecutor(max_workers = workers)
+        self.pending = {}
+        self.mixer_lock = threading.Lock()
+
+    def _cache_path(self, source_path, suffix):
+        with open(source_path, "rb") as source:
+            digest = hashlib.sha1(source.read()).hexdigest()
+
+        return os.path.join(self.cache_dir, f"{digest}-{suffix}")
+
+    def _write_cache(self, cache_path, data):
+        # Written under a temporary name first so a half-written file is never read back
+        try:
+            os.makedirs(self.cache_dir, exist_ok = True)
+            temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+
+            with open(temporary_path, "wb") as cache_file:
+                cache_file.write(data)
+
+            os.replace(temporary_path, cache_path)
+        except OSError as e:
+            print(f"Failed to write asset cache {cache_path}: {e}")
+
+    def _read_cache(self, cache_path, expected_size = None):
+        try:
+            with open(cache_path, "rb") as cache_file:
+                data = cache_file.read()
+        except OSError:
+            return None
+
+        if expected_size is not None and len(data) != expected_size:
+            return None
+
+        return data
+
+    def _load_pixels(self, path, size, alpha):
+        pixel_format = "RGBA" if alpha else "RGB"
+        cache_path = self._cache_path(path, f"{size[0]}x{size[1]}-{pixel_format.lower()}.raw")
+        pixels = self._read_cache(cache_path, size[0] * size[1] * len(pixel_format))
+
+        if pixels is None:
+            image = self.pygame.transform.scale(self.pygame.image.load(path), size)
+            pixels = self.pygame.image.tobytes(image, pixel_format)
+            self._write_cache(cache_path, pixels)
+
+        return pixels
+
+    def _ensure_mixer(self):
+        # Audio is brought up by the first sound that needs it, off the main thread
+        with self.mixer_lock:
+            if not self.pygame.mixer.get_init():
+                self.pygame.mixer.init()
+
+    def _load_pcm(self, path):
+        self._ensure_mixer()
+        frequency, sample_format, channels = self.pygame.mixer.get_init()
+        cache_path = self._cache_path(path, f"{frequency}-{sample_format}-{channels}.pcm")
+        pcm = self._read_cache(cache_path)
+
+        if pcm is None:
+            pcm = self.pygame.mixer.Sound(path).get_raw()
+            self._write_cache(cache_path, pcm)
+
+        return pcm
+
+    def image(self, name, path, size, alpha = False):
+        pixel_format = "RGBA" if alpha else "RGB"
+
+        # Decoding and scaling run on the pool; only the conversion to the display
+        # format touches the display, so it happens when the result is collected
+        def finish(pixels):
+            surface = self.pygame.image.frombytes(pixels, size, pixel_format)
+            return surface.convert_alpha() if alpha else surface.convert()
+
+        self.pending[name] = (self.executor.submit(self._load_pixels, path, size, alpha), finish)
+
+    def sound(self, name, path):
+        self.pending[name] = (self.executor.submit(self._load_pcm, path), lambda pcm: self.pygame.mixer.Sound(buffer = pcm))
+
+    def task(self, name, function, *args):
+        self.pending[name] = (self.executor.submit(function, *args), None)
+
+    def poll(self, wait = False):
+        loaded = {}
+
+        for name, (future, finish) in list(self.pending.items()):
+            if not wait and not future.done():
+                continue
+
+            del self.pending[name]
+
+            try:
+                value = future.result()
+                loaded[name] = finish(value) if finish is not None else value
+            except Exception as e:
+                print(f"Failed to load {name}: {e}")
+
+        return loaded
+
+    def is_done(self):
+        return not self.pending
+
+    def shutdown(self):
+        self.executor.shutdown(wait = False, cancel_futures = True)
@@ -0,0 +1,224 @@
+import math
+import numpy as np
+
+class BatchSimulator:
+    def __init__(self, games, seed = None, screen_width = 1920, screen_height = 1080, pipe_min_y = 320, pipe_max_y = 860,
+        pipe_spawn_interval = 2500, gap_size = 200, pipe_speed = 180, pipe_width = 78, step_ms = 1000 / 60, atlas = None):
+        self.games = games
+        self.seed = seed
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.pipe_min_y = pipe_min_y
+        self.pipe_max_y = pipe_max_y
+        self.pipe_spawn_interval = pipe_spawn_interval
+        self.gap_size = gap_size
+        self.pipe_speed = pipe_speed
+        self.pipe_width = pipe_width
+        self.step_ms = step_ms
+
+        # Same constants as Bird, Pipe and Ground
+        self.bird_x = 100
+        self.bird_width = 50
+        self.bird_height = 35
+        self.position_transition_speed = -math.log(0.9) * 60
+        self.angle_transition_speed = -math.log(0.8) * 60
+        self.animation_speed = 12
+        self.movement_threshold = 120
+        self.ground_top = screen_height - 100
+        self.pass_offset = 80
+        self.atlas = atlas
+        self._build_hitboxes()
+
+        # A pipe lives until it scrolls past the left edge, so only a handful are
+        # ever on screen at once and a small ring of slots is enough
+        pipe_lifetime_ms = (screen_width + self.pass_offset) / pipe_speed * 1000
+        self.pipe_slots = int(math.ceil(pipe_lifetime_ms / pipe_spawn_interval)) + 2
+
+        self.reset(seed)
+
+    def _build_hitboxes(self):
+        # For every animation frame and rotation step, the first and last opaque row
+        # of each mask column. Reduced over every column range a pipe can cover, a
+        # pipe test becomes two table lookups and gives the same answer as the mask
+        # overlap. Without an atlas the bird is its unrotated rect
+        if self.atlas is None:
+            profiles = [[(0, 0, np.zeros(self.bird_width), np.full(self.bird_width, float(self.bird_height)))]]
+        else:
+            profiles = [[self._column_profile(mask, offset) for _, mask, offset in entries] for entries in self.atlas.entries]
+
+        frames = len(profiles)
+        steps = len(profiles[0])
+        width = max(len(profile[2]) for entries in profiles for profile in entries)
+
+        self.hitbox_offsets = np.zeros((frames, steps, 2), dtype = np.int64)
+        self.hitbox_widths = np.zeros((frames, steps), dtype = np.int64)
+        self.range_top = np.full((frames, steps, width + 1, width + 1), np.inf)
+        self.range_bottom = np.full((frames, steps, width + 1, width + 1), -np.inf)
+
+        for frame, entries in enumerate(profiles):
+            for step, (offset_x, offset_y, tops, bottoms) in enumerate(entries):
+                self.hitbox_offsets[frame, step] = (offset_x, offset_y)
+                self.hitbox_widths[frame, step] = len(tops)
+
+                # Columns past the mask edge are empty
+                tops = np.concatenate((tops, np.full(width - len(tops), np.inf)))
+                bottoms = np.concatenate((bottoms, np.full(width - len(bottoms), -np.inf)))
+
+                for start in range(width):
+                    self.range_top[frame, step, start, start + 1:] = np.minimum.accumulate(tops[start:])
+                    self.range_bottom[frame, step, start, start + 1:] = np.maximum.accumulate(bottoms[start:])
+
+        self.hitbox_width = width
+        self.reach_left = self.bird_x + int(self.hitbox_offsets[:, :, 0].min())
+        self.reach_right = self.bird_x + int((self.hitbox_offsets[:, :, 0] + self.hitbox_widths).max())
+
+    def _column_profile(self, mask, offset):
+        width, height = mask.get_size()
+        tops = np.full(width, np.inf)
+        bottoms = np.full(width, -np.inf)
+
+        for x in range(width):
+            rows = [y for y in range(height) if mask.get_at((x, y))]
+
+            if rows:
+                tops[x] = rows[0]
+                bottoms[x] = rows[-1] + 1
+
+        return offset[0], offset[1], tops, bottoms
+
+    def angle_index(self, angle):
+        if self.atlas is None:
+            return np.zeros(angle.shape, dtype = np.intp)
+
+        angle = np.clip(angle, self.atlas.min_angle, self.atlas.max_angle)
+        return np.round((angle - self.atlas.min_angle) / self.atlas.angle_step).astype(np.intp)
+
+    def reset(self, seed = None):
+        if seed is not None:
+            self.seed = seed
+
+        games = self.games
+        self.rng = np.random.default_rng(self.seed)
+
+        self.y = np.full(games, float(self.screen_height // 2))
+        self.last_y = self.y.copy()
+        self.angle = np.zeros(games)
+        self.alive = np.ones(games, dtype = bool)
+        self.score = np.zeros(games, dtype = np.int32)
+        self.steps_alive = np.zeros(games, dtype = np.int32)
+
+        # Every game spawns on the same clock and scrolls at the same speed, so pipe
+        # x positions and passed flags are shared; only the gaps differ per game
+        self.pipe_x = np.zeros(self.pipe_slots)
+        self.pipe_active = np.zeros(self.pipe_slots, dtype = bool)
+        self.pipe_passed = np.zeros(self.pipe_slots, dtype = bool)
+        self.gap = np.zeros((games, self.pipe_slots))
+        self.next_slot = 0
+
+        self.frame = 0
+        self.time_ms = 0.0
+        self.animation_frame = 0
+        self.animation_counter = 0
+        self.pipe_spawn_timer = -self.pipe_spawn_interval
+
+    def spawn_pipe(self):
+        slot = self.next_slot
+        self.next_slot = (slot + 1) % self.pipe_slots
+
+        self.pipe_x[slot] = self.screen_width
+        self.pipe_active[slot] = True
+        self.pipe_passed[slot] = False
+        self.gap[:, slot] = self.rng.integers(self.pipe_min_y, self.pipe_max_y + 1, size = self.games)
+
+    def next_gap(self):
+        # Gap centre of the nearest pipe the bird has not cleared yet
+        ahead = self.pipe_active & (self.pipe_x + self.pipe_width > self.bird_x)
+
+        if not ahead.any():
+            return np.full(self.games, float(self.screen_height // 2))
+
+        candidates = np.where(ahead, self.pipe_x, np.inf)
+
+        return self.gap[:, int(np.argmin(candidates))]
+
+    def step(self, target_y):
+        if not self.alive.any():
+            return 0
+
+        self.frame += 1
+        self.time_ms += self.step_ms
+        dt = self.step_ms / 1000
+
+        # Bird.update, applied to every game at once
+        target_y = np.clip(np.trunc(target_y), 0, self.screen_height)
+        diff = target_y - self.y
+        self.y = np.where(np.abs(diff) > 0.5, self.y + diff * (1 - math.exp(-self.position_transition_speed * dt)), target_y)
+
+        movement = self.y - self.last_y
+        movement_threshold = self.movement_threshold * dt
+        target_angle = np.where(movement < -movement_threshold, -30.0, np.where(movement > movement_threshold, 30.0, 0.0))
+        angle_diff = target_angle - self.angle
+        angle_step = 1 - math.exp(-self.angle_transition_speed * dt)
+        self.angle = np.clip(np.where(np.abs(angle_diff) > 0.1, self.angle + angle_diff * angle_step, target_angle), -30, 30)
+        self.last_y = self.y
+
+        # The flap animation only depends on the step count, so it is shared too
+        self.animation_counter += self.animation_speed * dt
+
+        if self.animation_counter >= 1:
+            self.animation_frame = (self.animation_frame + 1) % self.range_top.shape[0]
+            self.animation_counter = 0
+
+        if self.time_ms - self.pipe_spawn_timer > self.pipe_spawn_interval:
+            self.spawn_pipe()
+            self.pipe_spawn_timer = self.time_ms
+
+        active = self.pipe_active
+        self.pipe_x[active] -= self.pipe_speed * dt
+
+        passed_now = active & ~self.pipe_passed & (self.pipe_x + self.pass_offset < self.bird_x)
+        self.pipe_passed |= passed_now
+        scored = int(passed_now.sum())
+
+        if scored:
+            self.score += self.alive * scored
+
+        self.pipe_active &= ~(self.pipe_x + self.pass_offset < 0)
+
+        # Ground.collide uses the bird rect, which pygame rounds
+        hit = np.floor(self.y + 0.5) + self.bird_height >= self.ground_top
+
+        # Pipes only need the exact test while one is level with the bird
+        overlapping = self.pipe_active & (self.pipe_x < self.reach_right) & (self.pipe_x + self.pipe_width > self.reach_left)
+
+        if overlapping.any():
+            step_index = self.angle_index(self.angle)
+            offsets = self.hitbox_offsets[self.animation_frame, step_index]
+            range_top = self.range_top[self.animation_frame]
+            range_bottom = self.range_bottom[self.animation_frame]
+            mask_x = self.bird_x + offsets[:, 0]
+            mask_y = np.trunc(self.y) + offsets[:, 1]
+
+            for slot in np.flatnonzero(overlapping):
+                start = np.clip(np.floor(self.pipe_x[slot] - mask_x), 0, self.hitbox_width).astype(np.intp)
+                end = np.clip(np.floor(self.pipe_x[slot] + self.pipe_width - mask_x), 0, self.hitbox_width).astype(np.intp)
+                gap = self.gap[:, slot]
+                hit |= mask_y + range_top[step_index, start, end] < gap - self.gap_size // 2
+                hit |= mask_y + range_bottom[step_index, start, end] > gap + self.gap_size // 2
+
+        self.steps_alive += self.alive
+        self.alive &= ~hit
+
+        return scored
+
+    def run(self, policy, max_steps):
+        for _ in range(max_steps):
+            if not self.alive.any():
+                break
+
+            self.step(policy(self))
+
+        return self.score
+
+    def score_distribution(self):
+        return np.bincount(self.score)
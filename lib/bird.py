@@ -1,39 +1,55 @@
+import math
+from lib.rotation_atlas import RotationAtlas
+
 class Bird:
-    def __init__(self, x, y, frames, pygame):
+    __slots__ = ("x", "y", "pygame", "frames", "current_frame", "animation_speed", "animation_counter", "rect", "target_y", "current_y",
+        "position_transition_speed", "angle", "target_angle", "angle_transition_speed", "last_y", "movement_threshold", "previous_y",
+        "previous_angle", "atlas")
+
+    def __init__(self, x, y, frames, pygame, atlas = None):
         self.x = x
         self.y = y
         self.pygame = pygame
         self.frames = frames
         self.current_frame = 0
-        self.animation_speed = 0.2
+
+        # Rates are per second so the bird behaves the same at any update rate; at
+        # 60 Hz they cover 10% and 20% of the remaining distance per step
+        self.animation_speed = 12
         self.animation_counter = 0
         self.rect = self.pygame.Rect(x, y, 50, 35)
         self.target_y = y
         self.current_y = y
-        self.position_transition_speed = 0.1
+        self.position_transition_speed = -math.log(0.9) * 60
         self.angle = 0
         self.target_angle = 0
-        self.angle_transition_speed = 0.2
+        self.angle_transition_speed = -math.log(0.8) * 60
         self.last_y = y
-        self.movement_threshold = 2
+        self.movement_threshold = 120
+        self.previous_y = y
+        self.previous_angle = 0
+        self.atlas = atlas if atlas is not None else RotationAtlas(frames, pygame)
     
     def set_position(self, new_target_y):
         self.target_y = new_target_y
     
-    def update(self):
+    def update(self, dt = 1 / 60):
+        self.previous_y = self.y
+        self.previous_angle = self.angle
         position_diff = self.target_y - self.current_y
 
         if abs(position_diff) > 0.5:
-            self.current_y += position_diff * self.position_transition_speed
+            self.current_y += position_diff * (1 - math.exp(-self.position_transition_speed * dt))
         else:
             self.current_y = self.target_y
 
         self.y = self.current_y
         y_movement = self.current_y - self.last_y
+        movement_threshold = self.movement_threshold * dt
 
-        if y_movement < -self.movement_threshold:
+        if y_movement < -movement_threshold:
             self.target_angle = -30
-        elif y_movement > self.movement_threshold:
+        elif y_movement > movement_threshold:
             self.target_angle = 30
         else:
             self.target_angle = 0
@@ -41,12 +57,12 @@ class Bird:
         angle_diff = self.target_angle - self.angle
 
         if abs(angle_diff) > 0.1:
-            self.angle += angle_diff * self.angle_transition_speed
+            self.angle += angle_diff * (1 - math.exp(-self.angle_transition_speed * dt))
         else:
             self.angle = self.target_angle
 
         self.angle = max(-30, min(self.angle, 30))
-        self.animation_counter += self.animation_speed
+        self.animation_counter += self.animation_speed * dt
 
         if self.animation_counter >= 1:
             self.current_frame = (self.current_frame + 1) % len(self.frames)
@@ -55,10 +71,16 @@ class Bird:
         self.last_y = self.current_y
         self.rect.y = self.y
     
-    def draw(self, screen):
-        rotated_bird = self.pygame.transform.rotate(self.frames[self.current_frame], -self.angle)
-        new_rect = rotated_bird.get_rect(center = self.frames[self.current_frame].get_rect(topleft = (self.x, self.y)).center)
-        screen.blit(rotated_bird, new_rect.topleft)
+    def draw(self, screen, alpha = 1.0):
+        # alpha is how far the renderer is between the previous and current update
+        y = self.previous_y + (self.y - self.previous_y) * alpha
+        angle = self.previous_angle + (self.angle - self.previous_angle) * alpha
+        rotated_bird, _, (offset_x, offset_y) = self.atlas.lookup(self.current_frame, angle)
+        return screen.blit(rotated_bird, (self.x + offset_x, y + offset_y))
     
     def get_mask(self):
-        return self.pygame.mask.from_surface(self.frames[self.current_frame])
\ No newline at end of file
+        return self.atlas.lookup(self.current_frame, self.angle)[1]
+
+    def get_mask_position(self):
+        offset_x, offset_y = self.atlas.lookup(self.current_frame, self.angle)[2]
+        return int(self.x + offset_x), int(self.y + offset_y)
@@ -27,38 +27,58 @@ class Button:
         # 3D properties
         self.shadow_offset = shadow_offset
         self.shadow_color = shadow_color
+
+        # Rendered faces keyed by hover state, text color and label
+        self.face_rect = self.rect.union(self.rect.move(shadow_offset, shadow_offset))
+        self.faces = {}
     
     def draw(self, screen, text_color):
 
         # Color change on hover
+        key = (self.is_hovered, tuple(text_color), self.text)
+        face = self.faces.get(key)
+
+        if face is None:
+            face = self._render_face(text_color)
+            self.faces[key] = face
+
+        return screen.blit(face, self.face_rect)
+
+    def _render_face(self, text_color):
+
+        # Shadow, body, border and label drawn once into a transparent surface
+        face = self.pygame.Surface(self.face_rect.size, self.pygame.SRCALPHA)
+        body_rect = self.rect.move(-self.face_rect.x, -self.face_rect.y)
         color = self.hover_color if self.is_hovered else self.color
 
-        shadow_rect = self.rect.move(self.shadow_offset, self.shadow_offset)
+        shadow_rect = body_rect.move(self.shadow_offset, self.shadow_offset)
         self.pygame.draw.rect(
-            screen,
+            face,
             self.shadow_color,
             shadow_rect,
             border_radius=self.radius
         )
 
         self.pygame.draw.rect(
-            screen,
+            face,
             color,
-            self.rect,
+            body_rect,
             border_radius=self.radius
         )
 
         if self.border_width > 0:
             self.pygame.draw.rect(
-                screen,
+                face,
                 self.border_color,
-                self.rect,
+                body_rect,
                 width=self.border_width,
                 border_radius=self.radius
             )
         text_surface = self.font.render(self.text, True, text_color)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        text_rect = text_surface.get_rect(center=body_rect.center)
+        face.blit(text_surface, text_rect)
+
+        return face
 
     def check_hover(self, pos):
         self.is_hovered = self.rect.collidepoint(pos)
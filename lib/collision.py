@@ -0,0 +1,66 @@
+class CollisionEngine:
+    def __init__(self, pygame):
+        self.pygame = pygame
+        self.pipe_masks = {}
+
+    def get_pipe_mask(self, width, height):
+        mask = self.pipe_masks.get((width, height))
+
+        if mask is None:
+            mask = self.pygame.mask.Mask((width, height), fill = True)
+            self.pipe_masks[(width, height)] = mask
+
+        return mask
+
+    def collide_pipe(self, bird, pipe, bird_mask = None, bird_position = None):
+        if bird_mask is None:
+            bird_mask = bird.get_mask()
+            bird_position = bird.get_mask_position()
+
+        bird_x, bird_y = bird_position
+        bird_width, bird_height = bird_mask.get_size()
+
+        if bird_x + bird_width <= pipe.x or bird_x >= pipe.x + pipe.pipe_width:
+            return None
+
+        # The pipe sprites extend pipe_height past the gap edges, so test against
+        # those extents rather than the on-screen rects to match the drawn pipes
+        top_pipe_y = pipe.top_y
+        bottom_pipe_y = pipe.bottom_y
+        pipe_mask = None
+
+        for pipe_y in (top_pipe_y, bottom_pipe_y):
+            if bird_y + bird_height <= pipe_y or bird_y >= pipe_y + pipe.pipe_height:
+                continue
+
+            if pipe_mask is None:
+                pipe_mask = self.get_pipe_mask(pipe.pipe_width, pipe.pipe_height)
+
+            collision = bird_mask.overlap(pipe_mask, (pipe.x - bird_x, pipe_y - bird_y))
+
+            if collision:
+                return collision
+
+        return None
+
+    def collide_any(self, bird, pipes):
+        bird_mask = bird.get_mask()
+        bird_position = bird.get_mask_position()
+        bird_left = bird_position[0]
+        bird_right = bird_left + bird_mask.get_size()[0]
+
+        # Pipes spawn at the right edge and all scroll at the same speed, so the
+        # list stays sorted by x and we can stop at the first pipe past the bird
+        for pipe in pipes:
+            pipe_x = pipe.x
+
+            if pipe_x >= bird_right:
+                break
+
+            if pipe_x + pipe.pipe_width <= bird_left:
+                continue
+
+            if self.collide_pipe(bird, pipe, bird_mask, bird_position):
+                return pipe
+
+        return None
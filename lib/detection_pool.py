@@ -0,0 +1,109 @@
+import multiprocessing
+import queue
+import numpy as np
+from multiprocessing import shared_memory
+from lib.detectors import load_detector
+from lib.face_finder import FaceFinder
+
+def _detection_process(shared_name, frame_shape, slot_count, task_queue, result_queue, model_path, detector_backend, finder_options):
+    shared = shared_memory.SharedMemory(name = shared_name)
+    frames = np.ndarray((slot_count,) + frame_shape, dtype = np.uint8, buffer = shared.buf)
+
+    try:
+        face_finder = FaceFinder(load_detector(model_path, detector_backend), color_order = "BGR", **finder_options)
+
+        while True:
+            task = task_queue.get()
+
+            if task is None:
+                break
+
+            slot, sequence, timestamp, roi_face = task
+
+            try:
+                faces = face_finder.find(frames[slot], roi_face)
+            except Exception as e:
+                print(f"Detection process error: {e}")
+                faces = []
+
+            result_queue.put((slot, sequence, timestamp, faces))
+    finally:
+        del frames
+        shared.close()
+
+class DetectionPool:
+    def __init__(self, frame_shape, model_path, detector_backend = None, workers = 2, slots_per_worker = 2, finder_options = None):
+        self.frame_shape = tuple(frame_shape)
+        self.slot_count = workers * slots_per_worker
+        frame_bytes = int(np.prod(self.frame_shape))
+        self.shared = shared_memory.SharedMemory(create = True, size = frame_bytes * self.slot_count)
+        self.frames = np.ndarray((self.slot_count,) + self.frame_shape, dtype = np.uint8, buffer = self.shared.buf)
+        self.free_slots = list(range(self.slot_count))
+        self.last_sequence = 0
+
+        # The pool starts while the asset loader, mixer and capture threads are running,
+        # and a plain fork would copy their held locks; the fork server is a fresh
+        # single-threaded process, and platforms without one spawn
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        context = multiprocessing.get_context(start_method)
+        self.task_queue = context.Queue()
+        self.result_queue = context.Queue()
+        self.processes = []
+
+        for _ in range(workers):
+            process = context.Process(
+                target = _detection_process,
+                args = (self.shared.name, self.frame_shape, self.slot_count, self.task_queue, self.result_queue, model_path, detector_backend, finder_options or {})
+            )
+            process.daemon = True
+            process.start()
+            self.processes.append(process)
+
+    def submit(self, frame, sequence, timestamp, roi_face = None):
+        if not self.free_slots:
+            return False
+
+        slot = self.free_slots.pop()
+        np.copyto(self.frames[slot], frame)
+        self.task_queue.put((slot, sequence, timestamp, roi_face))
+
+        return True
+
+    def has_free_slot(self):
+        return len(self.free_slots) > 0
+
+    def poll(self, timeout = 0):
+        results = []
+
+        while True:
+            try:
+                if timeout > 0:
+                    slot, sequence, timestamp, faces = self.result_queue.get(timeout = timeout)
+                    timeout = 0
+                else:
+                    slot, sequence, timestamp, faces = self.result_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            self.free_slots.append(slot)
+
+            # Workers finish out of order; only hand back results newer than the last one
+            if sequence > self.last_sequence:
+                self.last_sequence = sequence
+                results.append((sequence, timestamp, faces))
+
+        return results
+
+    def close(self):
+        for _ in self.processes:
+            self.task_queue.put(None)
+
+        for process in self.processes:
+            process.join(timeout = 1.0)
+
+            if process.is_alive():
+                process.terminate()
+
+        del self.frames
+        self.shared.close()
+        self.shared.unlink()
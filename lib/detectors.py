@@ -0,0 +1,162 @@
+import glob
+import os
+import cv2
+
+MODEL_PATH = os.path.join("assets", "models")
+DNN_CONFIG = "deploy.prototxt"
+DNN_WEIGHTS = "res10_300x300_ssd_iter_140000.caffemodel"
+
+class HaarDetector:
+    needs_color = False
+    supports_umat = True
+
+    def __init__(self, model_path, scale_factor = 1.1, min_neighbors = 5):
+        self.name = os.path.splitext(os.path.basename(model_path))[0]
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.cascade = cv2.CascadeClassifier(model_path)
+
+        if self.cascade.empty():
+            raise ValueError(f"Could not load cascade from {model_path}")
+
+    def detect(self, image, min_size, max_size):
+        faces = self.cascade.detectMultiScale(
+            image,
+            scaleFactor = self.scale_factor,
+            minNeighbors = self.min_neighbors,
+            minSize = (min_size, min_size),
+            maxSize = (max_size, max_size),
+            flags = cv2.CASCADE_SCALE_IMAGE
+        )
+
+        return [(int(x), int(y), int(w), int(h), 1.0) for x, y, w, h in faces]
+
+class DnnFaceDetector:
+    needs_color = True
+    supports_umat = False
+
+    def __init__(self, config_path, weights_path, confidence_threshold = 0.5, input_size = 300):
+        self.name = "dnn_res10"
+        self.confidence_threshold = confidence_threshold
+        self.input_size = input_size
+        self.net = cv2.dnn.readNetFromCaffe(config_path, weights_path)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+
+    def detect(self, image, min_size, max_size):
+        height, width = image.shape[:2]
+        blob = cv2.dnn.blobFromImage(image, 1.0, (self.input_size, self.input_size), (104.0, 177.0, 123.0), swapRB = True)
+        self.net.setInput(blob)
+        detections = self.net.forward()[0, 0]
+        faces = []
+
+        for _, _, confidence, x1, y1, x2, y2 in detections:
+            if confidence < self.confidence_threshold:
+                continue
+
+            x = int(max(0.0, x1) * width)
+            y = int(max(0.0, y1) * height)
+            w = int(min(1.0, x2) * width) - x
+            h = int(min(1.0, y2) * height) - y
+
+            if min_size <= max(w, h) <= max_size:
+                faces.append((x, y, w, h, float(confidence)))
+
+        return faces
+
+class UltralyticsDetector:
+    needs_color = True
+    supports_umat = False
+
+    # COCO pose keypoints 0-4: nose, left eye, right eye, left ear, right ear
+    FACE_KEYPOINTS = slice(0, 5)
+
+    def __init__(self, model_name = "yolov8n-pose.pt", confidence_threshold = 0.5, image_size = 320):
+        from ultralytics import YOLO
+
+        self.name = f"ultralytics_{os.path.splitext(os.path.basename(model_name))[0]}"
+        self.confidence_threshold = confidence_threshold
+        self.image_size = image_size
+        self.model = YOLO(model_name)
+
+    def detect(self, image, min_size, max_size):
+        results = self.model.predict(
+            image,
+            imgsz = self.image_size,
+            conf = self.confidence_threshold,
+            device = "cpu",
+            classes = [0],
+            verbose = False
+        )
+        faces = []
+
+        for result in results:
+            boxes = result.boxes.xyxy.cpu().numpy()
+            scores = result.boxes.conf.cpu().numpy()
+            keypoints = result.keypoints.data.cpu().numpy() if result.keypoints is not None else None
+
+            for i, (x1, y1, x2, y2) in enumerate(boxes):
+                face = None
+
+                if keypoints is not None:
+                    points = keypoints[i, self.FACE_KEYPOINTS]
+                    points = points[points[:, 2] > self.confidence_threshold, :2]
+
+                    if len(points) >= 2:
+                        (fx1, fy1), (fx2, fy2) = points.min(axis = 0), points.max(axis = 0)
+                        size = max(fx2 - fx1, fy2 - fy1) * 1.6
+                        center_x, center_y = (fx1 + fx2) / 2, (fy1 + fy2) / 2
+                        face = (center_x - size / 2, center_y - size / 2, size, size)
+
+                if face is None:
+                    # Without usable keypoints fall back to the top of the person box
+                    size = x2 - x1
+                    face = (x1, y1, size, min(size, y2 - y1))
+
+                x, y, w, h = (int(value) for value in face)
+
+                if min_size <= max(w, h) <= max_size:
+                    faces.append((x, y, w, h, float(scores[i])))
+
+        return faces
+
+def list_backends(model_path = MODEL_PATH):
+    backends = []
+
+    for cascade_path in sorted(glob.glob(os.path.join(model_path, "haarcascade_*.xml"))):
+        backends.append("haar:" + os.path.splitext(os.path.basename(cascade_path))[0][len("haarcascade_"):])
+
+    # The res10 model is not shipped with the game, so it is only offered once downloaded
+    if all(os.path.isfile(os.path.join(model_path, name)) for name in (DNN_CONFIG, DNN_WEIGHTS)):
+        backends.append("dnn")
+
+    backends.append("ultralytics")
+
+    return backends
+
+def load_detector(cascade_path, backend = None):
+    if backend is None:
+        return HaarDetector(cascade_path)
+
+    return create_detector(backend, os.path.dirname(cascade_path))
+
+def create_detector(backend, model_path = MODEL_PATH):
+    name, _, option = backend.partition(":")
+
+    if name == "haar":
+        return HaarDetector(os.path.join(model_path, f"haarcascade_{option or 'frontalface_alt'}.xml"))
+
+    if name == "dnn":
+        config_path = os.path.join(model_path, DNN_CONFIG)
+        weights_path = os.path.join(model_path, DNN_WEIGHTS)
+
+        for path in (config_path, weights_path):
+            if not os.path.isfile(path):
+                raise ValueError(f"DNN model file {path} not found")
+
+        return DnnFaceDetector(config_path, weights_path)
+
+    if name == "ultralytics":
+        return UltralyticsDetector(option or "yolov8n-pose.pt")
+
+    raise ValueError(f"Unknown detector backend: {backend}")
@@ -0,0 +1,135 @@
+import cv2
+import numpy as np
+
+class FaceFinder:
+    def __init__(self, detector, detection_mode = "tracking", detection_scale = 0.5, roi_padding = 0.75, max_misses = 3, full_scan_interval = 30, color_order = "RGB", use_umat = False):
+        self.detector = detector
+        self.detection_mode = detection_mode
+        self.detection_scale = detection_scale
+        self.roi_padding = roi_padding
+        self.max_misses = max_misses
+        self.full_scan_interval = full_scan_interval
+        self.color_order = color_order
+        # Frames go through cv2.UMat so OpenCL can run the conversion, resize and cascade
+        self.use_umat = use_umat and detector.supports_umat
+        self.min_face_size = 32
+        self.max_face_size = 320
+        self.detection_misses = 0
+        self.frames_since_full_scan = 0
+        self.gray_buffer = None
+        self.color_buffer = None
+        self.small_image_buffer = None
+
+    def plan_roi(self, smoothed_face):
+        if self.detection_mode != "tracking":
+            return None
+
+        self.frames_since_full_scan += 1
+
+        if (
+            smoothed_face is None or
+            self.detection_misses >= self.max_misses or
+            self.frames_since_full_scan >= self.full_scan_interval
+        ):
+            self.frames_since_full_scan = 0
+            return None
+
+        return tuple(int(value) for value in smoothed_face)
+
+    def report(self, faces):
+        if len(faces) > 0:
+            self.detection_misses = 0
+        else:
+            self.detection_misses += 1
+
+    def find(self, frame, roi_face = None):
+        if self.use_umat:
+            return self._find_umat(frame, roi_face)
+
+        image = self._prepare_image(frame)
+
+        if self.detection_mode != "tracking":
+            return self._run_detector(image, 1.0, 0, 0)
+
+        scale = self.detection_scale
+        small_size = (max(1, int(image.shape[1] * scale)), max(1, int(image.shape[0] * scale)))
+        small_shape = (small_size[1], small_size[0]) + image.shape[2:]
+
+        if self.small_image_buffer is None or self.small_image_buffer.shape != small_shape:
+            self.small_image_buffer = np.empty(small_shape, dtype = np.uint8)
+
+        small_image = cv2.resize(image, small_size, dst = self.small_image_buffer, interpolation = cv2.INTER_AREA)
+
+        if roi_face is None:
+            return self._run_detector(small_image, scale, 0, 0)
+
+        x, y, w, h = roi_face
+        padding = int(max(w, h) * self.roi_padding)
+        x1 = max(0, int((x - padding) * scale))
+        y1 = max(0, int((y - padding) * scale))
+        x2 = min(small_size[0], int((x + w + padding) * scale))
+        y2 = min(small_size[1], int((y + h + padding) * scale))
+
+        return self._run_detector(small_image[y1:y2, x1:x2], scale, x1, y1)
+
+    def _find_umat(self, frame, roi_face):
+        # The frame is uploaded once; every later step stays in UMat memory, and
+        # without an OpenCL device the same calls run on the CPU
+        conversion = cv2.COLOR_RGB2GRAY if self.color_order == "RGB" else cv2.COLOR_BGR2GRAY
+        image = cv2.cvtColor(cv2.UMat(frame), conversion)
+        height, width = frame.shape[:2]
+
+        if self.detection_mode != "tracking":
+            return self._run_detector(image, 1.0, 0, 0, (height, width))
+
+        scale = self.detection_scale
+        small_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        small_image = cv2.resize(image, small_size, interpolation = cv2.INTER_AREA)
+
+        if roi_face is None:
+            return self._run_detector(small_image, scale, 0, 0, (small_size[1], small_size[0]))
+
+        x, y, w, h = roi_face
+        padding = int(max(w, h) * self.roi_padding)
+        x1 = max(0, int((x - padding) * scale))
+        y1 = max(0, int((y - padding) * scale))
+        x2 = min(small_size[0], int((x + w + padding) * scale))
+        y2 = min(small_size[1], int((y + h + padding) * scale))
+
+        if x2 <= x1 or y2 <= y1:
+            return []
+
+        return self._run_detector(cv2.UMat(small_image, (y1, y2), (x1, x2)), scale, x1, y1, (y2 - y1, x2 - x1))
+
+    def _prepare_image(self, frame):
+        if self.detector.needs_color:
+            if self.color_order == "RGB":
+                return frame
+
+            if self.color_buffer is None or self.color_buffer.shape != frame.shape:
+                self.color_buffer = np.empty(frame.shape, dtype = np.uint8)
+
+            return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst = self.color_buffer)
+
+        if self.gray_buffer is None or self.gray_buffer.shape != frame.shape[:2]:
+            self.gray_buffer = np.empty(frame.shape[:2], dtype = np.uint8)
+
+        conversion = cv2.COLOR_RGB2GRAY if self.color_order == "RGB" else cv2.COLOR_BGR2GRAY
+
+        return cv2.cvtColor(frame, conversion, dst = self.gray_buffer)
+
+    def _run_detector(self, image, scale, offset_x, offset_y, shape = None):
+        # A UMat has no shape, so its caller passes one
+        height, width = (shape or image.shape)[:2]
+        min_size = max(1, int(self.min_face_size * scale))
+        max_size = max(min_size, int(self.max_face_size * scale))
+
+        if height < min_size or width < min_size:
+            return []
+
+        faces = self.detector.detect(image, min_size, max_size)
+
+        return [
+            (int((x + offset_x) / scale), int((y + offset_y) / scale), int(w / scale), int(h / scale), confidence)
+            for x, y, w, h, confidence in faces
+        ]
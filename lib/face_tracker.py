@@ -0,0 +1,76 @@
+class FaceTracker:
+    def __init__(self, alpha = 0.5, beta = 0.15, size_smoothing = 0.3, max_prediction = 0.25, max_coast = 0.5, prediction_lead = 0.0):
+        # alpha and beta are the alpha-beta filter gains for position and velocity
+        self.alpha = alpha
+        self.beta = beta
+        self.size_smoothing = size_smoothing
+        self.max_prediction = max_prediction
+        self.max_coast = max_coast
+        self.prediction_lead = prediction_lead
+        self.reset()
+
+    def reset(self):
+        # One tuple so a reader on another thread never mixes two updates
+        self.state = None
+
+    def is_tracking(self):
+        return self.state is not None
+
+    def update(self, box, timestamp):
+        x, y, w, h = box
+        center_x = x + w / 2
+        center_y = y + h / 2
+        state = self.state
+
+        if state is None or timestamp - state[3] > self.max_coast:
+            self.state = ((center_x, center_y), (0.0, 0.0), (w, h), timestamp)
+            return
+
+        (position_x, position_y), (velocity_x, velocity_y), (width, height), last_timestamp = state
+        dt = timestamp - last_timestamp
+
+        # Results from parallel detectors can arrive with the same or an older
+        # timestamp; fold those into the position without touching the velocity
+        if dt <= 0:
+            position_x += self.alpha * (center_x - position_x)
+            position_y += self.alpha * (center_y - position_y)
+            self.state = ((position_x, position_y), (velocity_x, velocity_y), (width, height), last_timestamp)
+            return
+
+        predicted_x = position_x + velocity_x * dt
+        predicted_y = position_y + velocity_y * dt
+        residual_x = center_x - predicted_x
+        residual_y = center_y - predicted_y
+
+        position = (predicted_x + self.alpha * residual_x, predicted_y + self.alpha * residual_y)
+        velocity = (velocity_x + self.beta * residual_x / dt, velocity_y + self.beta * residual_y / dt)
+        size = (width + self.size_smoothing * (w - width), height + self.size_smoothing * (h - height))
+        self.state = (position, velocity, size, timestamp)
+
+    def miss(self, timestamp):
+        # Short dropouts coast on the last estimate; longer ones drop the track
+        if self.state is not None and timestamp - self.state[3] > self.max_coast:
+            self.state = None
+
+    def predict(self, timestamp):
+        state = self.state
+
+        if state is None:
+            return None
+
+        (position_x, position_y), (velocity_x, velocity_y), _, last_timestamp = state
+
+        # Extrapolation is capped so a stale velocity cannot fling the estimate away
+        horizon = max(0.0, min(timestamp + self.prediction_lead - last_timestamp, self.max_prediction))
+
+        return position_x + velocity_x * horizon, position_y + velocity_y * horizon
+
+    def get_box(self):
+        state = self.state
+
+        if state is None:
+            return None
+
+        (position_x, position_y), _, (width, height), _ = state
+
+        return position_x - width / 2, position_y - height / 2, width, height
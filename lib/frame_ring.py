@@ -0,0 +1,81 @@
+import threading
+
+class FrameRing:
+    def __init__(self, size = 4):
+        self.size = size
+        self.frames = [None] * size
+        self.sequences = [0] * size
+        self.timestamps = [0.0] * size
+        self.readers = [0] * size
+        self.consumed = [True] * size
+        self.latest_index = -1
+        self.sequence = 0
+        self.dropped_frames = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def allocate(self, allocator):
+        # Frames published into the old buffers are forgotten so nobody reads an
+        # unwritten new buffer under an old sequence; the sequence counter and
+        # reader counts carry on for frames still held elsewhere
+        with self.condition:
+            self.frames = [allocator() for _ in range(self.size)]
+            self.sequences = [0] * self.size
+            self.timestamps = [0.0] * self.size
+            self.consumed = [True] * self.size
+            self.latest_index = -1
+            self.closed = False
+
+    def write_slot(self):
+        with self.condition:
+            for step in range(1, self.size + 1):
+                index = (self.latest_index + step) % self.size
+
+                if index != self.latest_index and self.readers[index] == 0:
+                    return index, self.frames[index]
+
+        return None, None
+
+    def publish(self, index, frame, timestamp):
+        with self.condition:
+            if self.latest_index >= 0 and not self.consumed[self.latest_index]:
+                self.dropped_frames += 1
+
+            self.sequence += 1
+            self.frames[index] = frame
+            self.sequences[index] = self.sequence
+            self.timestamps[index] = timestamp
+            self.consumed[index] = False
+            self.latest_index = index
+            self.condition.notify_all()
+
+            return self.sequence
+
+    def acquire_latest(self, last_sequence = 0):
+        with self.condition:
+            return self._acquire_latest(last_sequence)
+
+    def wait_for_frame(self, last_sequence = 0, timeout = None):
+        with self.condition:
+            self.condition.wait_for(lambda: self.closed or self.sequence > last_sequence, timeout)
+            return self._acquire_latest(last_sequence)
+
+    def _acquire_latest(self, last_sequence):
+        index = self.latest_index
+
+        if index < 0 or self.sequences[index] <= last_sequence:
+            return None
+
+        self.readers[index] += 1
+        self.consumed[index] = True
+
+        return index, self.sequences[index], self.timestamps[index], self.frames[index]
+
+    def release(self, index):
+        with self.condition:
+            self.readers[index] -= 1
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
@@ -0,0 +1,129 @@
+import random
+from lib.bird import Bird
+from lib.pipe import PipePool
+from lib.ground import Ground
+from lib.collision import CollisionEngine
+from lib.rotation_atlas import RotationAtlas
+from lib.profiler import Profiler
+
+def create_placeholder_bird_frames(pygame):
+    placeholder = pygame.Surface((50, 35), pygame.SRCALPHA)
+    pygame.draw.ellipse(placeholder, (255, 255, 0), (0, 0, 50, 35))
+    pygame.draw.ellipse(placeholder, (0, 0, 0), (35, 10, 10, 10))
+    pygame.draw.polygon(placeholder, (255, 0, 0), [(50, 17), (60, 12), (60, 22)])
+
+    return [placeholder]
+
+class GameState:
+    def __init__(self, pygame, seed = None, screen_width = 1920, screen_height = 1080, pipe_min_y = 320, pipe_max_y = 860,
+        pipe_spawn_interval = 2500, step_ms = 1000 / 60, bird_frames = None, bird_atlas = None, ground_img = None,
+        pipe_sprites = None, pipe_width = 78, pipe_height = 1080, collision_engine = None, profiler = None, players = 1,
+        recorder = None):
+        self.pygame = pygame
+        self.seed = seed
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.pipe_min_y = pipe_min_y
+        self.pipe_max_y = pipe_max_y
+        self.pipe_spawn_interval = pipe_spawn_interval
+        self.step_ms = step_ms
+        self.bird_frames = bird_frames if bird_frames is not None else create_placeholder_bird_frames(pygame)
+        self.bird_atlas = bird_atlas if bird_atlas is not None else RotationAtlas(self.bird_frames, pygame)
+        self.ground_img = ground_img
+        self.pipe_sprites = pipe_sprites
+        self.pipe_width = pipe_width
+        self.pipe_height = pipe_height
+        self.collision_engine = collision_engine if collision_engine is not None else CollisionEngine(pygame)
+        self.profiler = profiler if profiler is not None else Profiler()
+        self.players = players
+        self.recorder = recorder
+        self.pipes = PipePool(pygame, screen_height, pipe_width, pipe_height, pipe_sprites)
+        self.reset(seed)
+
+    def reset(self, seed = None):
+        if seed is not None:
+            self.seed = seed
+
+        # Unseeded games still draw a seed of their own so a session can be replayed
+        self.game_seed = self.seed if self.seed is not None else random.randrange(1 << 32)
+        self.rng = random.Random(self.game_seed)
+        self.pipe_gaps = []
+        self.birds = [Bird(100, self.screen_height // 2, self.bird_frames, self.pygame, self.bird_atlas) for _ in range(self.players)]
+        self.bird = self.birds[0]
+        self.alive = [True] * self.players
+        self.scores = [0] * self.players
+        self.ground = Ground(self.screen_width, self.screen_height - 100, self.ground_img, self.pygame)
+        self.pipes.clear()
+        self.score = 0
+        self.game_over = False
+        self.frame = 0
+        self.time_ms = 0.0
+
+        # The first pipe spawns on the first step, like the live game did
+        self.pipe_spawn_timer = -self.pipe_spawn_interval
+
+    def spawn_pipe(self):
+        gap_height = self.rng.randint(self.pipe_min_y, self.pipe_max_y)
+        self.pipes.spawn(self.screen_width, gap_height)
+        self.pipe_gaps.append(gap_height)
+
+        return gap_height
+
+    def step(self, target_y = None):
+        if self.game_over:
+            return 0
+
+        self.frame += 1
+        self.time_ms += self.step_ms
+
+        # Several players pass one target each; a single target drives the only bird
+        targets = target_y if isinstance(target_y, (list, tuple)) else (target_y,)
+
+        if self.recorder is not None:
+            self.recorder.record_step(targets)
+
+        dt = self.step_ms / 1000
+
+        for i, bird in enumerate(self.birds):
+            if not self.alive[i]:
+                continue
+
+            target = targets[i] if i < len(targets) else None
+
+            if target is not None:
+                bird.set_position(int(max(0, min(target, self.screen_height))))
+
+            bird.update(dt)
+
+        self.ground.update(dt)
+
+        if self.time_ms - self.pipe_spawn_timer > self.pipe_spawn_interval:
+            self.spawn_pipe()
+            self.pipe_spawn_timer = self.time_ms
+
+        # Every bird flies at the same x, so a pipe is passed by all living birds at once
+        scored = self.pipes.update(dt, self.bird.x)
+        if scored:
+            for i in range(self.players):
+                if self.alive[i]:
+                    self.scores[i] += scored
+
+            self.score = max(self.scores)
+
+        with self.profiler.scope("collision"):
+            for i, bird in enumerate(self.birds):
+                if self.alive[i] and (self.collision_engine.collide_any(bird, self.pipes) or self.ground.collide(bird)):
+                    self.alive[i] = False
+
+        self.game_over = not any(self.alive)
+
+        return scored
+
+    def run(self, inputs, max_steps = None):
+        for target_y in inputs:
+            if self.game_over or (max_steps is not None and self.frame >= max_steps):
+                break
+
+            self.step(target_y)
+
+        return self.score
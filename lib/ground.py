@@ -1,17 +1,21 @@
 class Ground:
+    __slots__ = ("x", "y", "pygame", "x1", "x2", "speed", "last_step", "image", "rect")
+
     def __init__(self, x, y, ground_img, pygame):
         self.x = x
         self.y = y
         self.pygame = pygame
         self.x1 = 0
         self.x2 = self.x
-        self.speed = 3
+        self.speed = 180
+        self.last_step = 0
         self.image = ground_img
         self.rect = self.pygame.Rect(0, y, self.x, 100)
     
-    def update(self):
-        self.x1 -= self.speed
-        self.x2 -= self.speed
+    def update(self, dt = 1 / 60):
+        self.last_step = self.speed * dt
+        self.x1 -= self.last_step
+        self.x2 -= self.last_step
         
         if self.x1 + self.x < 0:
             self.x1 = self.x2 + self.x
@@ -19,9 +23,14 @@ class Ground:
         if self.x2 + self.x < 0:
             self.x2 = self.x1 + self.x
     
-    def draw(self, screen):
-        screen.blit(self.image, (self.x1, self.y))
-        screen.blit(self.image, (self.x2, self.y))
+    def draw(self, screen, alpha = 1.0):
+        # The tiles wrap around, so step back by the scroll distance instead of
+        # interpolating between positions
+        offset = self.last_step * (1 - alpha)
+        first_rect = screen.blit(self.image, (self.x1 + offset, self.y))
+        second_rect = screen.blit(self.image, (self.x2 + offset, self.y))
+
+        return first_rect, second_rect
     
     def collide(self, bird):
         return bird.rect.bottom >= self.rect.top
\ No newline at end of file
@@ -0,0 +1,29 @@
+import cv2
+
+def resolve_opencl(mode = "auto"):
+    # "auto" uses OpenCL when OpenCV finds a device, "on" also says so when it
+    # cannot, and "off" keeps every cv2 call on numpy arrays
+    if mode == "off":
+        return False
+
+    try:
+        if cv2.ocl.haveOpenCL():
+            cv2.ocl.setUseOpenCL(True)
+
+        enabled = cv2.ocl.useOpenCL()
+    except Exception as e:
+        print(f"OpenCL check failed: {e}")
+        enabled = False
+
+    if enabled:
+        print(f"OpenCL enabled on {opencl_device_name()}")
+    elif mode == "on":
+        print("OpenCL requested but not available, using CPU")
+
+    return enabled
+
+def opencl_device_name():
+    try:
+        return cv2.ocl.Device.getDefault().name() or "unknown device"
+    except Exception:
+        return "unknown device"
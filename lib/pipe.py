@@ -1,42 +1,139 @@
+from collections import deque
+
 class Pipe:
-    def __init__(self, x, screen_height, gap_height, pygame, pipe_width = 78, pipe_height = 1080):
-        self.x = x
-        self.screen_height = screen_height
+    # A pipe is a view onto one slot of a PipePool, which owns the actual state
+    __slots__ = ("pool", "slot")
+
+    def __init__(self, pool, slot):
+        self.pool = pool
+        self.slot = slot
+
+    @property
+    def x(self):
+        return self.pool.x[self.slot]
+
+    @property
+    def previous_x(self):
+        return self.pool.previous_x[self.slot]
+
+    @property
+    def gap_height(self):
+        return self.pool.gap_height[self.slot]
+
+    @property
+    def passed(self):
+        return self.pool.passed[self.slot]
+
+    @property
+    def pipe_width(self):
+        return self.pool.pipe_width
+
+    @property
+    def pipe_height(self):
+        return self.pool.pipe_height
+
+    @property
+    def top_y(self):
+        # The pipe sprites extend pipe_height past the gap edges
+        return self.pool.gap_height[self.slot] - self.pool.gap_size // 2 - self.pool.pipe_height
+
+    @property
+    def bottom_y(self):
+        return self.pool.gap_height[self.slot] + self.pool.gap_size // 2
+
+    def draw(self, screen, pipe_img = None, alpha = 1.0):
+        top_pipe, bottom_pipe = self.pool.get_sprites(pipe_img)
+        x = self.previous_x + (self.x - self.previous_x) * alpha
+        top_rect = screen.blit(top_pipe, (x, self.top_y))
+        bottom_rect = screen.blit(bottom_pipe, (x, self.bottom_y))
+
+        return top_rect, bottom_rect
+
+    def collide(self, bird, collision_engine):
+        return collision_engine.collide_pipe(bird, self)
+
+class PipePool:
+    def __init__(self, pygame, screen_height, pipe_width = 78, pipe_height = 1080, sprites = None, gap_size = 200, speed = 180, pass_offset = 80, capacity = 8):
         self.pygame = pygame
-        self.gap_height = gap_height
-        self.gap_size = 200
-        self.speed = 3
-        self.passed = False
+        self.screen_height = screen_height
         self.pipe_width = pipe_width
         self.pipe_height = pipe_height
-        self.top_pipe_rect = self.pygame.Rect(x, 0, pipe_width, gap_height - self.gap_size // 2)
-        self.bottom_pipe_rect = self.pygame.Rect(x, gap_height + self.gap_size // 2, pipe_width,  screen_height - (gap_height + self.gap_size // 2))
-    
-    def update(self):
-        self.x -= self.speed
-        self.top_pipe_rect.x = self.x
-        self.bottom_pipe_rect.x = self.x
-    
-    def draw(self, screen, pipe_img):
-        scaled_pipe_img = self.pygame.transform.scale(pipe_img, (self.pipe_width, self.pipe_height))
-        top_pipe = self.pygame.transform.flip(scaled_pipe_img, False, True)
-        top_pipe_y = self.top_pipe_rect.height - self.pipe_height
-        screen.blit(top_pipe, (self.x, top_pipe_y))
-        screen.blit(scaled_pipe_img, (self.x, self.bottom_pipe_rect.y))
-    
-    def collide(self, bird):
-        bird_mask = bird.get_mask()
-
-        top_mask = self.pygame.mask.Mask((self.pipe_width, self.pipe_height))
-        top_mask.fill()
-        
-        bottom_mask = self.pygame.mask.Mask((self.pipe_width, self.pipe_height))
-        bottom_mask.fill()
-        
-        top_offset = (self.x - bird.x, (self.top_pipe_rect.height - self.pipe_height) - bird.y)
-        bottom_offset = (self.x - bird.x, self.bottom_pipe_rect.y - bird.y)
-        
-        top_collision = bird_mask.overlap(top_mask, top_offset)
-        bottom_collision = bird_mask.overlap(bottom_mask, bottom_offset)
-        
-        return top_collision or bottom_collision
\ No newline at end of file
+        self.sprites = sprites
+        self.gap_size = gap_size
+        self.speed = speed
+        self.pass_offset = pass_offset
+        self.x = []
+        self.previous_x = []
+        self.gap_height = []
+        self.passed = []
+        self.free = []
+
+        # Live pipes in spawn order, which is also x order since they all scroll at
+        # the same speed; the oldest is always the first to leave, so removal is a popleft
+        self.active = deque()
+
+        for _ in range(capacity):
+            self._add_slot()
+
+    def _add_slot(self):
+        self.free.append(Pipe(self, len(self.x)))
+        self.x.append(0.0)
+        self.previous_x.append(0.0)
+        self.gap_height.append(0)
+        self.passed.append(False)
+
+    def __len__(self):
+        return len(self.active)
+
+    def __iter__(self):
+        return iter(self.active)
+
+    def clear(self):
+        self.free.extend(self.active)
+        self.active.clear()
+
+    def spawn(self, x, gap_height):
+        if not self.free:
+            self._add_slot()
+
+        pipe = self.free.pop()
+        slot = pipe.slot
+        self.x[slot] = x
+        self.previous_x[slot] = x
+        self.gap_height[slot] = gap_height
+        self.passed[slot] = False
+        self.active.append(pipe)
+
+        return pipe
+
+    def update(self, dt = 1 / 60, bird_x = None):
+        # Moves every pipe, scores those that fell pass_offset behind bird_x and
+        # recycles the ones that left the screen, in one pass
+        step = self.speed * dt
+        pass_offset = self.pass_offset
+        x = self.x
+        previous_x = self.previous_x
+        passed = self.passed
+        active = self.active
+        scored = 0
+
+        for pipe in active:
+            slot = pipe.slot
+            previous_x[slot] = x[slot]
+            x[slot] -= step
+
+            if bird_x is not None and not passed[slot] and x[slot] + pass_offset < bird_x:
+                passed[slot] = True
+                scored += 1
+
+        while active and x[active[0].slot] + pass_offset < 0:
+            self.free.append(active.popleft())
+
+        return scored
+
+    def get_sprites(self, pipe_img = None):
+        if self.sprites is None:
+            scaled_pipe_img = self.pygame.transform.scale(pipe_img, (self.pipe_width, self.pipe_height))
+            self.sprites = (self.pygame.transform.flip(scaled_pipe_img, False, True), scaled_pipe_img)
+
+        return self.sprites
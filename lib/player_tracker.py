@@ -0,0 +1,80 @@
+from lib.face_tracker import FaceTracker
+
+class PlayerTracker:
+    def __init__(self, max_players = 2, max_match_distance = 1.0, **tracker_options):
+        # max_match_distance is in face widths; a detection further than that from
+        # every player is treated as someone new rather than a jump
+        self.max_players = max_players
+        self.max_match_distance = max_match_distance
+        self.trackers = [FaceTracker(**tracker_options) for _ in range(max_players)]
+
+    def reset(self):
+        for tracker in self.trackers:
+            tracker.reset()
+
+    def update(self, faces, timestamp):
+        # Each tracked player first predicts where it should be at this frame
+        predictions = [tracker.predict(timestamp) for tracker in self.trackers]
+        pairs = []
+
+        for player, prediction in enumerate(predictions):
+            if prediction is None:
+                continue
+
+            _, _, width, height = self.trackers[player].get_box()
+            gate = max(width, height) * self.max_match_distance
+
+            for index, (x, y, w, h, _) in enumerate(faces):
+                distance = ((x + w / 2 - prediction[0]) ** 2 + (y + h / 2 - prediction[1]) ** 2) ** 0.5
+
+                if distance <= gate:
+                    pairs.append((distance, player, index))
+
+        # Greedy matching on the closest pairs; with at most a handful of players it
+        # agrees with an optimal assignment whenever the faces are not overlapping
+        matched_players = set()
+        matched_faces = set()
+
+        for distance, player, index in sorted(pairs):
+            if player in matched_players or index in matched_faces:
+                continue
+
+            x, y, w, h, _ = faces[index]
+            self.trackers[player].update((x, y, w, h), timestamp)
+            matched_players.add(player)
+            matched_faces.add(index)
+
+        for player, tracker in enumerate(self.trackers):
+            if player not in matched_players:
+                tracker.miss(timestamp)
+
+        # New faces take the free slots from the left of the mirrored picture, so
+        # players standing side by side get P1, P2, ... in screen order
+        new_faces = sorted((face for index, face in enumerate(faces) if index not in matched_faces), key = lambda face: -(face[0] + face[2] / 2))
+        free_players = [player for player, tracker in enumerate(self.trackers) if not tracker.is_tracking()]
+
+        for player, (x, y, w, h, _) in zip(free_players, new_faces):
+            self.trackers[player].update((x, y, w, h), timestamp)
+
+    def predict(self, player, timestamp):
+        return self.trackers[player].predict(timestamp)
+
+    def get_box(self, player):
+        return self.trackers[player].get_box()
+
+    def is_tracking(self, player):
+        return self.trackers[player].is_tracking()
+
+    def get_bounds(self):
+        # One box around every tracked player, so a single detection pass covers them all
+        boxes = [box for box in (tracker.get_box() for tracker in self.trackers) if box is not None]
+
+        if not boxes:
+            return None
+
+        x1 = min(x for x, _, _, _ in boxes)
+        y1 = min(y for _, y, _, _ in boxes)
+        x2 = max(x + w for x, _, w, _ in boxes)
+        y2 = max(y + h for _, y, _, h in boxes)
+
+        return (x1, y1, x2 - x1, y2 - y1)
@@ -0,0 +1,151 @@
+import json
+import time
+from collections import deque
+
+class _Scope:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+NULL_SCOPE = _NullScope()
+
+class Profiler:
+    def __init__(self, enabled = False, window = 300, log_path = None, hud_refresh = 30, pygame = None):
+        self.enabled = enabled
+        self.pygame = pygame
+        self.window = window
+        self.log_path = log_path
+        self.hud_refresh = hud_refresh
+        self.hud_visible = False
+        self.samples = {}
+        self.scopes = {}
+        self.frame_index = 0
+        self.frame_timings = {}
+        self.log_file = None
+        self.hud_lines = []
+        self.hud_surfaces = []
+
+        if enabled and log_path is not None:
+            self.log_file = open(log_path, "w", buffering = 1)
+
+            if not self._is_jsonl():
+                self.log_file.write("frame,scope,ms\n")
+
+    def _is_jsonl(self):
+        return self.log_path.endswith(".jsonl") or self.log_path.endswith(".json")
+
+    def scope(self, name):
+        if not self.enabled:
+            return NULL_SCOPE
+
+        scope = self.scopes.get(name)
+
+        if scope is None:
+            scope = _Scope(self, name)
+            self.scopes[name] = scope
+
+        return scope
+
+    def record(self, name, duration):
+        if not self.enabled:
+            return
+
+        samples = self.samples.get(name)
+
+        if samples is None:
+            samples = deque(maxlen = self.window)
+            self.samples[name] = samples
+
+        samples.append(duration)
+        self.frame_timings[name] = self.frame_timings.get(name, 0.0) + duration
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+
+        # Webcam threads record into the same dict, so swap it out before reading
+        frame_timings, self.frame_timings = self.frame_timings, {}
+
+        if self.log_file is not None:
+            self._write_frame(list(frame_timings.items()))
+
+        self.frame_index += 1
+
+    def _write_frame(self, frame_timings):
+        if self._is_jsonl():
+            timings = { name: round(duration * 1000, 4) for name, duration in frame_timings }
+            self.log_file.write(json.dumps({ "frame": self.frame_index, "ms": timings }) + "\n")
+        else:
+            for name, duration in frame_timings:
+                self.log_file.write(f"{self.frame_index},{name},{duration * 1000:.4f}\n")
+
+    def percentiles(self, name):
+        samples = self.samples.get(name)
+
+        if not samples:
+            return None
+
+        ordered = sorted(samples)
+        last = len(ordered) - 1
+
+        return tuple(ordered[int(round(last * q))] * 1000 for q in (0.50, 0.95, 0.99))
+
+    def summary(self):
+        lines = [f"{'scope':<20} {'p50':>7} {'p95':>7} {'p99':>7}"]
+
+        for name in sorted(self.samples):
+            p50, p95, p99 = self.percentiles(name)
+            lines.append(f"{name:<20} {p50:>7.2f} {p95:>7.2f} {p99:>7.2f}")
+
+        return lines
+
+    def toggle_hud(self):
+        self.hud_visible = not self.hud_visible
+
+    def draw_hud(self, screen, font, position = (32, 80), color = (255, 255, 255)):
+        if not self.enabled or not self.hud_visible:
+            return
+
+        # Percentiles and glyphs are only refreshed every few frames so the HUD does
+        # not dominate the timings it is showing
+        if not self.hud_surfaces or self.frame_index % self.hud_refresh == 0:
+            self.hud_lines = self.summary()
+            self.hud_surfaces = [font.render(line, True, color) for line in self.hud_lines]
+
+        line_height = font.get_linesize()
+        width = max(surface.get_width() for surface in self.hud_surfaces) + 16
+        height = line_height * len(self.hud_surfaces) + 16
+        backdrop = self.pygame.Rect(position[0] - 8, position[1] - 8, width, height)
+        self.pygame.draw.rect(screen, (0, 0, 0), backdrop)
+
+        for i, surface in enumerate(self.hud_surfaces):
+            screen.blit(surface, (position[0], position[1] + i * line_height))
+
+    def close(self):
+        if self.enabled:
+            for line in self.summary():
+                print(line)
+
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
@@ -0,0 +1,74 @@
+import json
+import time
+from collections import deque
+
+# Ordered from best looking to cheapest; "normal" matches the fixed settings the
+# game used before the governor existed
+QUALITY_LEVELS = [
+    { "name": "high", "capture_size": (640, 480), "background_fps": 30, "detection_scale": 0.5, "scale_factor": 1.1, "min_neighbors": 5 },
+    { "name": "normal", "capture_size": (640, 480), "background_fps": 15, "detection_scale": 0.5, "scale_factor": 1.1, "min_neighbors": 5 },
+    { "name": "reduced", "capture_size": (640, 480), "background_fps": 10, "detection_scale": 0.4, "scale_factor": 1.15, "min_neighbors": 4 },
+    { "name": "low", "capture_size": (320, 240), "background_fps": 10, "detection_scale": 0.75, "scale_factor": 1.2, "min_neighbors": 4 },
+    { "name": "minimal", "capture_size": (320, 240), "background_fps": 5, "detection_scale": 0.5, "scale_factor": 1.25, "min_neighbors": 3 }
+]
+
+class QualityGovernor:
+    def __init__(self, target_fps = 60, level = "normal", adaptive = True, window = 90, max_detection_latency = 0.15,
+        degrade_after = 2.0, upgrade_after = 10.0, log_path = None):
+        self.target_fps = target_fps
+        self.frame_budget = 1.0 / target_fps
+        self.level = next(i for i, quality in enumerate(QUALITY_LEVELS) if quality["name"] == level)
+        self.adaptive = adaptive
+        self.max_detection_latency = max_detection_latency
+        self.degrade_after = degrade_after
+        self.upgrade_after = upgrade_after
+        self.frame_times = deque(maxlen = window)
+        self.webcam = None
+        self.last_change = time.perf_counter()
+        self.log_file = open(log_path, "w", buffering = 1) if log_path is not None else None
+
+    def attach(self, webcam):
+        self.webcam = webcam
+        self.last_change = time.perf_counter()
+        self._apply("camera ready")
+
+    def update(self, frame_time, now):
+        # frame_time is the busy part of the frame, before the clock waits out the rest
+        self.frame_times.append(frame_time)
+
+        if not self.adaptive or self.webcam is None or len(self.frame_times) < self.frame_times.maxlen:
+            return
+
+        ordered = sorted(self.frame_times)
+        frame_p90 = ordered[int(0.9 * (len(ordered) - 1))]
+        latency = self.webcam.detection_latency
+        since_change = now - self.last_change
+
+        # Degrading reacts within seconds; upgrading waits for a long calm stretch so
+        # the level does not bounce between two settings
+        if frame_p90 > self.frame_budget * 0.9 or latency > self.max_detection_latency:
+            if since_change >= self.degrade_after and self.level < len(QUALITY_LEVELS) - 1:
+                self._change(self.level + 1, frame_p90, latency, now)
+        elif frame_p90 < self.frame_budget * 0.5 and latency < self.max_detection_latency * 0.5:
+            if since_change >= self.upgrade_after and self.level > 0:
+                self._change(self.level - 1, frame_p90, latency, now)
+
+    def _change(self, level, frame_p90, latency, now):
+        direction = "down" if level > self.level else "up"
+        self.level = level
+        self.last_change = now
+        self.frame_times.clear()
+        self._apply(f"{direction}: frame p90 {frame_p90 * 1000:.1f} ms of {self.frame_budget * 1000:.1f} ms, detection latency {latency * 1000:.0f} ms")
+
+    def _apply(self, reason):
+        quality = QUALITY_LEVELS[self.level]
+        capture_resize = self.webcam.set_quality(quality)
+        print(f"Quality {quality['name']} ({reason}), capture size {capture_resize}")
+
+        if self.log_file is not None:
+            self.log_file.write(json.dumps({ "time": round(time.time(), 3), "level": quality["name"], "reason": reason, "capture_resize": capture_resize }) + "\n")
+
+    def close(self):
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
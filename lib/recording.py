@@ -0,0 +1,247 @@
+import json
+import os
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+
+# A recording is a directory holding the raw BGR frames back to back, one index
+# row per frame and a small header describing the frame shape. A row holds the
+# face found in its own frame; frames the detector skipped repeat the result of
+# the latest earlier frame it looked at
+FRAMES_FILE = "frames.raw"
+INDEX_FILE = "index.bin"
+META_FILE = "meta.json"
+
+INDEX_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("center_x", "<i4"),
+    ("center_y", "<i4"),
+    ("has_face", "u1")
+])
+
+def is_recording(path):
+    return os.path.isfile(os.path.join(str(path), META_FILE))
+
+def open_capture(source, realtime = False, loop = False):
+    if is_recording(source):
+        return ReplayCapture(source, realtime, loop)
+
+    return cv2.VideoCapture(source)
+
+class FrameRecorder:
+    def __init__(self, path, frame_shape, fps = 30, max_pending = 30, await_detection = True, detection_timeout = 0.5):
+        self.path = path
+        self.frame_shape = tuple(frame_shape)
+        self.frame_count = 0
+        self.dropped_frames = 0
+        os.makedirs(path, exist_ok = True)
+
+        with open(os.path.join(path, META_FILE), "w") as meta_file:
+            json.dump({ "shape": list(self.frame_shape), "dtype": "uint8", "fps": fps }, meta_file)
+
+        self.frames_file = open(os.path.join(path, FRAMES_FILE), "wb")
+        self.index_file = open(os.path.join(path, INDEX_FILE), "wb")
+        self.row = np.zeros(1, dtype = INDEX_DTYPE)
+
+        # The capture thread only copies into a free buffer; the disk writes happen
+        # on the writer thread, and a frame is dropped when every buffer is still queued
+        self.free_buffers = queue.Queue()
+        self.pending = queue.Queue()
+
+        # Detection results arrive after their frame was captured, so each frame
+        # waits in the queue until the detector has reported on it or moved past it
+        self.await_detection = await_detection
+        self.detection_timeout = detection_timeout
+        self.results = {}
+        self.reported_sequence = 0
+        self.last_result = (0, 0, False)
+        self.closing = False
+        self.condition = threading.Condition()
+
+        for _ in range(max_pending):
+            self.free_buffers.put(np.empty(self.frame_shape, dtype = np.uint8))
+
+        self.writer_thread = threading.Thread(target = self._writer_worker)
+        self.writer_thread.daemon = True
+        self.writer_thread.start()
+
+    def write(self, frame, timestamp, sequence = None):
+        if self.frames_file is None or frame.shape != self.frame_shape:
+            return False
+
+        try:
+            buffer = self.free_buffers.get_nowait()
+        except queue.Empty:
+            self.dropped_frames += 1
+            return False
+
+        np.copyto(buffer, frame)
+        self.pending.put((buffer, timestamp, sequence))
+
+        return True
+
+    def report(self, sequence, centroid, has_face):
+        with self.condition:
+            self.results[sequence] = (int(centroid[0]), int(centroid[1]), bool(has_face))
+            self.reported_sequence = max(self.reported_sequence, sequence)
+            self.condition.notify_all()
+
+    def _detection_for(self, sequence):
+        with self.condition:
+            if sequence is not None and self.await_detection:
+                self.condition.wait_for(lambda: self.closing or self.reported_sequence >= sequence, self.detection_timeout)
+
+                for reported in sorted(reported for reported in self.results if reported <= sequence):
+                    self.last_result = self.results.pop(reported)
+
+            return self.last_result
+
+    def _writer_worker(self):
+        while True:
+            task = self.pending.get()
+
+            if task is None:
+                break
+
+            buffer, timestamp, sequence = task
+            center_x, center_y, has_face = self._detection_for(sequence)
+
+            # Index rows go out with every frame so a crash loses at most the frames
+            # still sitting in the queue and the file buffers
+            try:
+                self.frames_file.write(buffer.data)
+                self.row[0] = (timestamp, center_x, center_y, has_face)
+                self.index_file.write(self.row.tobytes())
+                self.frame_count += 1
+            except Exception as e:
+                print(f"Recording write error: {e}")
+            finally:
+                self.free_buffers.put(buffer)
+
+    def close(self):
+        if self.frames_file is not None:
+            # Frames already queued are written before the files close
+            with self.condition:
+                self.closing = True
+                self.condition.notify_all()
+
+            self.pending.put(None)
+            self.writer_thread.join()
+            self.frames_file.close()
+            self.index_file.close()
+            self.frames_file = None
+            self.index_file = None
+
+            if self.dropped_frames > 0:
+                print(f"Recording dropped {self.dropped_frames} frames while the disk fell behind")
+
+class ReplayCapture:
+    def __init__(self, path, realtime = True, loop = True):
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+
+        with open(os.path.join(path, META_FILE)) as meta_file:
+            meta = json.load(meta_file)
+
+        self.frame_shape = tuple(meta["shape"])
+        self.fps = meta.get("fps", 30)
+        frame_bytes = int(np.prod(self.frame_shape))
+        frames_size = os.path.getsize(os.path.join(path, FRAMES_FILE))
+        index = np.fromfile(os.path.join(path, INDEX_FILE), dtype = INDEX_DTYPE)
+
+        # Trailing rows or frames without a partner come from an interrupted recording
+        self.frame_count = min(frames_size // frame_bytes, len(index))
+        self.index = index[:self.frame_count]
+        self.frames = None
+
+        if self.frame_count > 0:
+            self.frames = np.memmap(os.path.join(path, FRAMES_FILE), dtype = np.uint8, mode = "r", shape = (self.frame_count,) + self.frame_shape)
+
+        self.position = 0
+        self.clock_start = None
+
+    def isOpened(self):
+        return self.frames is not None
+
+    def seek(self, frame_index):
+        if self.frame_count == 0:
+            return False
+
+        self.position = max(0, min(int(frame_index), self.frame_count - 1))
+        self.clock_start = None
+
+        return True
+
+    def read(self, image = None):
+        if self.frames is None:
+            return False, None
+
+        if self.position >= self.frame_count:
+            if not self.loop:
+                return False, None
+
+            self.seek(0)
+
+        if self.realtime:
+            self._wait_for_frame(self.position)
+
+        frame = self.frames[self.position]
+        self.position += 1
+
+        if image is not None and image.shape == frame.shape:
+            np.copyto(image, frame)
+            return True, image
+
+        return True, np.array(frame)
+
+    def _wait_for_frame(self, frame_index):
+        timestamp = self.index["timestamp"][frame_index]
+
+        # Playback clock restarts on every seek or loop so pacing follows the
+        # gaps between recorded timestamps
+        if self.clock_start is None:
+            self.clock_start = (time.perf_counter(), timestamp)
+            return
+
+        wall_start, recorded_start = self.clock_start
+        delay = (timestamp - recorded_start) - (time.perf_counter() - wall_start)
+
+        if delay > 0:
+            time.sleep(delay)
+
+    def get_centroid(self, frame_index):
+        row = self.index[frame_index]
+        return (int(row["center_x"]), int(row["center_y"])), bool(row["has_face"])
+
+    def get_centroids(self):
+        return np.stack((self.index["center_x"], self.index["center_y"]), axis = 1), self.index["has_face"].astype(bool)
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return self.seek(value)
+
+        return False
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_POS_FRAMES:
+            return float(self.position)
+
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.frame_count)
+
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.fps)
+
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.frame_shape[1])
+
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.frame_shape[0])
+
+        return 0.0
+
+    def release(self):
+        self.frames = None
@@ -0,0 +1,60 @@
+class Renderer:
+    def __init__(self, pygame, screen, dim_color = (0, 0, 0, 128)):
+        self.pygame = pygame
+        self.screen = screen
+        self.dim_color = dim_color
+        self.dim_overlays = {}
+        self.background = None
+        self.use_dirty_rects = False
+        self.full_redraw = True
+        self.dirty_rects = []
+        self.previous_rects = []
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def begin_frame(self, background, static = False):
+        # Anything that is not a fixed surface (the webcam feed) has to be redrawn
+        # everywhere, so dirty rects only apply when the background stays put
+        if not static or not self.use_dirty_rects or background is not self.background:
+            self.full_redraw = True
+
+        self.background = background
+        self.use_dirty_rects = static
+
+        if self.full_redraw:
+            self.screen.blit(background, (0, 0))
+        else:
+            for rect in self.previous_rects:
+                self.screen.blit(background, rect, rect)
+
+    def mark(self, *rects):
+        self.dirty_rects.extend(rects)
+
+    def dim(self, target):
+        size = target.get_size()
+        overlay = self.dim_overlays.get(size)
+
+        if overlay is None:
+            overlay = self.pygame.Surface(size, self.pygame.SRCALPHA)
+            overlay.fill(self.dim_color)
+            self.dim_overlays[size] = overlay
+
+        target.blit(overlay, (0, 0))
+
+    def compose(self, background, draw):
+        layer = background.copy()
+        draw(layer)
+
+        return layer
+
+    def end_frame(self):
+        if self.full_redraw or not self.use_dirty_rects:
+            self.pygame.display.flip()
+        else:
+            # Last frame's rects are where sprites were erased, this frame's are where they are now
+            self.pygame.display.update(self.previous_rects + self.dirty_rects)
+
+        self.previous_rects = self.dirty_rects
+        self.dirty_rects = []
+        self.full_redraw = False
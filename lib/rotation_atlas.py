@@ -0,0 +1,28 @@
+class RotationAtlas:
+    def __init__(self, frames, pygame, angle_step = 2, min_angle = -30, max_angle = 30):
+        self.pygame = pygame
+        self.angle_step = angle_step
+        self.min_angle = min_angle
+        self.max_angle = max_angle
+        self.steps = int(round((max_angle - min_angle) / angle_step)) + 1
+        self.entries = [self._build_frame(frame) for frame in frames]
+
+    def _build_frame(self, frame):
+        entries = []
+        frame_center = frame.get_rect().center
+
+        for step in range(self.steps):
+            angle = min(self.min_angle + step * self.angle_step, self.max_angle)
+            rotated = self.pygame.transform.rotate(frame, -angle)
+            rotated_rect = rotated.get_rect(center = frame_center)
+            mask = self.pygame.mask.from_surface(rotated)
+            entries.append((rotated, mask, rotated_rect.topleft))
+
+        return entries
+
+    def angle_index(self, angle):
+        angle = max(self.min_angle, min(angle, self.max_angle))
+        return int(round((angle - self.min_angle) / self.angle_step))
+
+    def lookup(self, frame_index, angle):
+        return self.entries[frame_index][self.angle_index(angle)]
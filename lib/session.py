@@ -0,0 +1,203 @@
+import os
+import struct
+
+# A session file is a fixed header with everything GameState needs to rebuild the
+# game, the per-step target stream, and a footer with the seek index, the pipe
+# gaps and the result; the last 12 bytes point back at the footer
+MAGIC = b"FCVS"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQdIIIIIII")
+TRAILER = struct.Struct("<Q4s")
+TRAILER_MAGIC = b"FCVE"
+INDEX_INTERVAL = 600
+
+# Targets are stored as the clamped integer the bird actually receives, as a
+# zigzag varint of the change since the player's last target; 0 means no target
+NO_TARGET = 0
+
+def _write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+
+    buffer.append(value)
+
+def _read_varint(data, offset):
+    value = 0
+    shift = 0
+
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+
+        if byte < 0x80:
+            return value, offset
+
+        shift += 7
+
+class SessionRecorder:
+    def __init__(self, game):
+        self.config = (
+            game.players, game.game_seed, game.step_ms, game.screen_width, game.screen_height,
+            game.pipe_min_y, game.pipe_max_y, game.pipe_spawn_interval, game.pipe_width, game.pipe_height
+        )
+        self.players = game.players
+        self.screen_height = game.screen_height
+        self.stream = bytearray()
+        self.index = []
+        self.last = [0] * game.players
+        self.steps = 0
+
+    def record_step(self, targets):
+        if self.steps % INDEX_INTERVAL == 0:
+            self.index.append((self.steps, len(self.stream), tuple(self.last)))
+
+        self.steps += 1
+        stream = self.stream
+
+        for i in range(self.players):
+            target = targets[i] if i < len(targets) else None
+
+            if target is None:
+                stream.append(NO_TARGET)
+                continue
+
+            target = int(max(0, min(target, self.screen_height)))
+            delta = target - self.last[i]
+            self.last[i] = target
+            code = ((delta << 1) ^ (delta >> 63)) + 1
+
+            if code < 0x80:
+                stream.append(code)
+            else:
+                _write_varint(stream, code)
+
+    def save(self, path, game):
+        footer = bytearray()
+        footer += struct.pack("<II", self.steps, len(self.index))
+
+        for step, offset, last in self.index:
+            footer += struct.pack(f"<II{self.players}H", step, offset, *last)
+
+        footer += struct.pack(f"<I{len(game.pipe_gaps)}H", len(game.pipe_gaps), *game.pipe_gaps)
+        footer += struct.pack(f"<{self.players}I", *game.scores)
+
+        directory = os.path.dirname(path)
+
+        if directory:
+            os.makedirs(directory, exist_ok = True)
+
+        with open(path, "wb") as session_file:
+            session_file.write(HEADER.pack(MAGIC, VERSION, *self.config))
+            session_file.write(self.stream)
+            footer_offset = session_file.tell()
+            session_file.write(footer)
+            session_file.write(TRAILER.pack(footer_offset, TRAILER_MAGIC))
+
+class Session:
+    def __init__(self, path):
+        with open(path, "rb") as session_file:
+            data = session_file.read()
+
+        if len(data) < HEADER.size + TRAILER.size or data[:len(MAGIC)] != MAGIC or data[-len(TRAILER_MAGIC):] != TRAILER_MAGIC:
+            raise ValueError(f"{path} is not a session file")
+
+        _, version, *config = HEADER.unpack_from(data, 0)
+        footer_offset, _ = TRAILER.unpack_from(data, len(data) - TRAILER.size)
+
+        if version != VERSION:
+            raise ValueError(f"{path} has unsupported session version {version}")
+
+        if not HEADER.size <= footer_offset <= len(data) - TRAILER.size:
+            raise ValueError(f"{path} is truncated")
+
+        (self.players, self.seed, self.step_ms, self.screen_width, self.screen_height,
+            self.pipe_min_y, self.pipe_max_y, self.pipe_spawn_interval, self.pipe_width, self.pipe_height) = config
+        self.path = path
+        self.stream = memoryview(data)[HEADER.size:footer_offset]
+
+        try:
+            self._read_footer(data, footer_offset)
+        except struct.error as e:
+            raise ValueError(f"{path} has a damaged footer: {e}")
+
+    def _read_footer(self, data, offset):
+        self.steps, index_count = struct.unpack_from("<II", data, offset)
+        offset += 8
+        entry = struct.Struct(f"<II{self.players}H")
+        self.index = []
+
+        for _ in range(index_count):
+            step, stream_offset, *last = entry.unpack_from(data, offset)
+            self.index.append((step, stream_offset, last))
+            offset += entry.size
+
+        gap_count, = struct.unpack_from("<I", data, offset)
+        self.gaps = list(struct.unpack_from(f"<{gap_count}H", data, offset + 4))
+        offset += 4 + 2 * gap_count
+        self.scores = list(struct.unpack_from(f"<{self.players}I", data, offset))
+        self.score = max(self.scores)
+
+    def game_options(self):
+        return {
+            "seed": self.seed,
+            "screen_width": self.screen_width,
+            "screen_height": self.screen_height,
+            "pipe_min_y": self.pipe_min_y,
+            "pipe_max_y": self.pipe_max_y,
+            "pipe_spawn_interval": self.pipe_spawn_interval,
+            "step_ms": self.step_ms,
+            "pipe_width": self.pipe_width,
+            "pipe_height": self.pipe_height,
+            "players": self.players
+        }
+
+    def targets(self, start_step = 0):
+        # Decoding starts at the last index entry before start_step instead of the beginning
+        step, offset, last = 0, 0, [0] * self.players
+
+        for entry in self.index:
+            if entry[0] > start_step:
+                break
+
+            step, offset, last = entry[0], entry[1], list(entry[2])
+
+        stream = self.stream
+        players = self.players
+
+        while step < self.steps:
+            targets = []
+
+            for i in range(players):
+                code = stream[offset]
+
+                if code < 0x80:
+                    offset += 1
+                else:
+                    code, offset = _read_varint(stream, offset)
+
+                if code == NO_TARGET:
+                    targets.append(None)
+                    continue
+
+                code -= 1
+                last[i] += (code >> 1) ^ -(code & 1)
+                targets.append(last[i])
+
+            if step >= start_step:
+                yield targets
+
+            step += 1
+
+def replay_session(session, pygame, **game_options):
+    # Runs the session headlessly as fast as the logic allows; a run is genuine
+    # when it rebuilds the same pipes and reaches the recorded scores. Collisions
+    # use the bird masks, so bird_frames and bird_atlas must match the game's
+    from lib.game_state import GameState
+
+    game = GameState(pygame, **session.game_options(), **game_options)
+    game.run(session.targets(), session.steps)
+    verified = game.scores == session.scores and game.frame == session.steps and game.pipe_gaps == session.gaps
+
+    return game, verified
@@ -1,74 +1,132 @@
-import threading
+import time
+
+# Each category gets its own reserved channel, so a new click or point only ever
+# cuts off a sound of the same kind
+DEFAULT_CATEGORIES = {
+    "music": ["backsound"],
+    "ui": ["button"],
+    "effects": ["beep", "point"],
+    "jingle": ["lose"]
+}
 
 class SoundManager:
-    def __init__(self, sounds_dict):
+    def __init__(self, sounds_dict, pygame = None, categories = None):
         self.sounds = sounds_dict
+        self.pygame = pygame
+        self.categories = categories if categories is not None else DEFAULT_CATEGORIES
+        self.sound_categories = { name: category for category, names in self.categories.items() for name in names }
+        self.channels = None
         self.looping_status = { name: False for name in sounds_dict }
-        self.timeout_timers = {}
-        
-    def play(self, sound_name, volume = 1.0, loop = False):
-        self.set_volume(sound_name, volume)
+        self.timeouts = {}
+        self.volumes = {}
+        self.states = {}
+        self.state = None
 
-        if not self.looping_status[sound_name]:
-            if loop:
-                self.sounds[sound_name].play(-1)
-            else:
-                self.sounds[sound_name].play()
-            
-            self.looping_status[sound_name] = True
+    def _get_channel(self, sound_name):
+        if self.channels is None:
+            # Channels can only be reserved once the mixer is up, which is when the first sound exists
+            self.pygame.mixer.set_reserved(len(self.categories))
+            self.channels = { category: self.pygame.mixer.Channel(i) for i, category in enumerate(self.categories) }
 
-    def play_timeout(self, sound_name, volume = 1.0, loop = False, timeout = None):
-        self.set_volume(sound_name, volume)
+        return self.channels[self.sound_categories.get(sound_name, "effects")]
+
+    def _start(self, sound_name, volume, loop):
+        channel = self._get_channel(sound_name)
+        channel.play(self.sounds[sound_name], -1 if loop else 0)
 
-        if loop:
-            self.sounds[sound_name].play(-1)
-        else:
-            self.sounds[sound_name].play()
+        if self.volumes.get(sound_name) != volume:
+            self.set_volume(sound_name, volume)
 
         self.looping_status[sound_name] = True
 
+    def play(self, sound_name, volume = 1.0, loop = False):
+        if sound_name not in self.sounds:
+            return
+
+        if not self.looping_status.get(sound_name, False):
+            self._start(sound_name, volume, loop)
+
+    def play_timeout(self, sound_name, volume = 1.0, loop = False, timeout = None):
+        if sound_name not in self.sounds:
+            return
+
+        self._start(sound_name, volume, loop)
+
+        # Checked from update() on the main loop instead of a timer thread per call
         if timeout is not None:
-            self._set_timeout(sound_name, timeout)
-
-    def _set_timeout(self, sound_name, timeout_seconds):
-        if sound_name in self.timeout_timers:
-            self.timeout_timers[sound_name].cancel()
-        
-        timer = threading.Timer(timeout_seconds, self._on_timeout, [sound_name])
-        timer.daemon = True
-        timer.start()
-        self.timeout_timers[sound_name] = timer
-    
-    def _on_timeout(self, sound_name):
+            self.timeouts[sound_name] = time.perf_counter() + timeout
+
+    def update(self, now = None):
+        if not self.timeouts:
+            return
+
+        now = time.perf_counter() if now is None else now
+
+        for sound_name, deadline in list(self.timeouts.items()):
+            if now >= deadline:
+                self.looping_status[sound_name] = False
+                del self.timeouts[sound_name]
+
+    def add_state(self, state, keep = (), start = ()):
+        # keep: sounds allowed to carry on into the state; start: (name, loop) pairs played on entry
+        self.states[state] = (set(keep), list(start))
+
+    def enter_state(self, state):
+        if state == self.state:
+            return
+
+        self.state = state
+        keep, start = self.states.get(state, (set(), []))
+
+        for sound_name in self.sounds:
+            if sound_name not in keep and self.looping_status.get(sound_name, False):
+                self.stop(sound_name)
+
+        for sound_name, loop in start:
+            self.play(sound_name, loop = loop)
+
+    def replace(self, sound_name, sound):
+        # A sound that arrives while its placeholder loops takes over on the next play
+        if sound_name in self.sounds:
+            self.stop(sound_name)
+
+        self.sounds[sound_name] = sound
         self.looping_status[sound_name] = False
+        self.volumes.pop(sound_name, None)
+
+        # Sounds that load after their state was entered still start
+        _, start = self.states.get(self.state, (set(), []))
+
+        for start_name, loop in start:
+            if start_name == sound_name:
+                self.play(sound_name, loop = loop)
 
-        if sound_name in self.timeout_timers:
-            del self.timeout_timers[sound_name]
-    
     def stop(self, sound_name):
+        if sound_name not in self.sounds:
+            return
+
         self.sounds[sound_name].stop()
 
         if sound_name in self.looping_status:
             self.looping_status[sound_name] = False
 
-        if sound_name in self.timeout_timers:
-            self.timeout_timers[sound_name].cancel()
-            del self.timeout_timers[sound_name]
-    
+        self.timeouts.pop(sound_name, None)
+
     def stop_all(self):
         for sound_name in self.sounds:
             self.stop(sound_name)
 
     def stop_all_except(self, sound_name = []):
         for name in self.sounds:
-            if name not in sound_name:
+            if name not in sound_name and self.looping_status.get(name, False):
                 self.stop(name)
 
-                if name in self.looping_status:
-                    self.looping_status[name] = False
-    
     def set_volume(self, sound_name, volume):
+        if sound_name not in self.sounds:
+            return
+
         self.sounds[sound_name].set_volume(volume)
-    
+        self.volumes[sound_name] = volume
+
     def is_playing(self, sound_name):
-        return self.looping_status.get(sound_name, False)
\ No newline at end of file
+        return self.looping_status.get(sound_name, False)
@@ -0,0 +1,39 @@
+class SpriteCache:
+    def __init__(self, pygame):
+        self.pygame = pygame
+        self.sprites = {}
+        self.resolution = None
+        self.sources = {}
+
+    def sync(self, resolution, sources):
+        source_ids = { name: id(image) for name, image in sources.items() }
+
+        if resolution != self.resolution or source_ids != self.sources:
+            self.clear()
+            self.resolution = resolution
+            self.sources = source_ids
+
+    def get(self, image, width, height, flip = False):
+        key = (id(image), width, height, flip)
+        sprite = self.sprites.get(key)
+
+        if sprite is None:
+            sprite = self.pygame.transform.scale(image, (width, height))
+
+            if flip:
+                sprite = self.pygame.transform.flip(sprite, False, True)
+
+            # Keep a reference to the source so its id is not reused while cached
+            self.sprites[key] = (sprite, image)
+            return sprite
+
+        return sprite[0]
+
+    def get_pipe_sprites(self, image, width, height):
+        top_sprite = self.get(image, width, height, flip = True)
+        bottom_sprite = self.get(image, width, height, flip = False)
+
+        return top_sprite, bottom_sprite
+
+    def clear(self):
+        self.sprites.clear()
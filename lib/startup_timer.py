@@ -0,0 +1,25 @@
+import time
+
+class StartupTimer:
+    def __init__(self, start = None):
+        self.start = time.perf_counter() if start is None else start
+        self.events = []
+        self.reported = False
+
+    def mark(self, name, thread = "main", timestamp = None):
+        # list.append is atomic, so background loaders can mark without a lock
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+        self.events.append((timestamp - self.start, thread, name))
+
+    def report(self):
+        self.reported = True
+        last_by_thread = {}
+        lines = [f"{'at ms':>8} {'phase ms':>9}  {'thread':<8} phase"]
+
+        for at, thread, name in sorted(self.events):
+            phase = at - last_by_thread.get(thread, 0.0)
+            last_by_thread[thread] = at
+            lines.append(f"{at * 1000:>8.1f} {phase * 1000:>9.1f}  {thread:<8} {name}")
+
+        for line in lines:
+            print(line)
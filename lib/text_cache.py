@@ -0,0 +1,43 @@
+from collections import OrderedDict
+
+class TextCache:
+    def __init__(self, max_entries = 256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias = True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.entries.get(key)
+
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last = False)
+
+        return surface
+
+    def blit_number(self, target, font, prefix, number, color, position, antialias = True):
+        # Counters change every few seconds, so they are laid out from one glyph per
+        # digit instead of rasterizing a new string for every value
+        prefix_surface = self.render(font, prefix, color, antialias)
+        rect = target.blit(prefix_surface, position)
+        x = position[0] + prefix_surface.get_width()
+
+        for digit in str(number):
+            glyph = self.render(font, digit, color, antialias)
+            rect.union_ip(target.blit(glyph, (x, position[1])))
+            x += glyph.get_width()
+
+        return rect
+
+    def clear(self):
+        self.entries.clear()
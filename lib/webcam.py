@@ -1,107 +1,321 @@
 import cv2
 import time
 import threading
-import queue
 import numpy as np
 from collections import deque
+from lib.frame_ring import FrameRing
+from lib.detectors import load_detector
+from lib.face_finder import FaceFinder
+from lib.detection_pool import DetectionPool
+from lib.profiler import Profiler
+from lib.recording import FrameRecorder, ReplayCapture
+from lib.face_tracker import FaceTracker
+from lib.player_tracker import PlayerTracker
+from lib.opencl import resolve_opencl
 
 class Webcam:
-    def __init__(self, model_path, window_width, window_height, rect_color = (255, 0, 0), rect_thickness = 2, rect_padding = 8, fps = 15, pygame = None, video_input = 0):
+    def __init__(self, model_path, window_width, window_height, rect_color = (255, 0, 0), rect_thickness = 2, rect_padding = 8, fps = 15, pygame = None, video_input = 0,
+        detection_mode = "tracking", detection_scale = 0.5, roi_padding = 0.75, max_misses = 3, full_scan_interval = 30,
+        detector_backend = None, detection_workers = 0, profiler = None, record_path = None, replay_path = None, replay_realtime = True, replay_loop = True,
+        face_tracking = "predictive", prediction_lead = 0.0, max_players = 1, player_colors = None, opencl = "auto"):
         self.model_path = model_path
+        self.detector_backend = detector_backend
         self.window_width = window_width
         self.window_height = window_height
         self.video_input = video_input
+        self.record_path = record_path
+        self.replay_path = replay_path
+        self.replay_realtime = replay_realtime
+        self.replay_loop = replay_loop
+        self.recorder = None
         self.rect_color = rect_color
         self.rect_thickness = rect_thickness
         self.rect_padding = rect_padding
         self.webcam = None
         self.pygame = pygame
+        self.profiler = profiler if profiler is not None else Profiler()
         self.fps = fps
         self.frame_interval = 1.0 / fps
         self.last_frame_time = 0
         self.last_frame = None
-        self.face_cascade = None
-        self.frame_queue = queue.Queue(maxsize = 2)
-        self.processed_frame = None
+        self.detector = None
+        self.frame_ring = FrameRing()
+        self.detection_result = None
         self.detection_thread = None
+        self.capture_thread = None
         self.running = False
-        self._load_cascade()
+        self.capturing = False
+        self.capture_size_request = None
+        self.use_opencl = resolve_opencl(opencl)
+        self._load_detector()
         self.face_centroid = { "center_x": 0, "center_y": 0 }
         self.has_valid_face = False
+        self.detection_latency = 0.0
+        self.first_valid_sequence = 0
         self.webcam_height = 480
         self.webcam_width = 640
+        self.face_tracking = face_tracking
         self.face_history = deque(maxlen = 5)
+        self.face_tracker = FaceTracker(prediction_lead = prediction_lead)
+        self.max_players = max_players
+        self.player_colors = player_colors
+        self.player_tracker = PlayerTracker(max_players, prediction_lead = prediction_lead) if max_players > 1 else None
         self.smoothed_face = None
+        self.finder_options = {
+            "detection_mode": detection_mode,
+            "detection_scale": detection_scale,
+            "roi_padding": roi_padding,
+            "max_misses": max_misses,
+            "full_scan_interval": full_scan_interval
+        }
+        # Worker processes stay on numpy; the OpenCL context is not shared with them
+        self.face_finder = FaceFinder(self.detector, color_order = "BGR", use_umat = self.use_opencl, **self.finder_options) if self.detector is not None else None
+        self.detection_workers = detection_workers
+        self.detection_pool = None
+        self.last_frame_sequence = 0
+        self.crop_slice = None
+        self.crop_origin = (0, 0)
+        self.crop_size = (0, 0)
+        self.crop_frame_shape = None
+        self.crop_rgb_buffer = None
+        self.crop_mirror_buffer = None
+        self.background_buffer = None
+        self.background_surface = None
 
-    def _load_cascade(self):
+    def _load_detector(self):
         try:
-            self.face_cascade = cv2.CascadeClassifier(self.model_path)
-            print("Face cascade loaded successfully")
+            self.detector = load_detector(self.model_path, self.detector_backend)
+
+            print(f"Face detector {self.detector.name} loaded successfully")
         except Exception as e:
-            print(f"Failed to load face cascade: {e}")
-            self.face_cascade = None
+            print(f"Failed to load face detector: {e}")
+            self.detector = None
+
+    def get_centroid(self, timestamp = None):
+        # The predictive tracker answers for the moment the caller renders, which
+        # hides the capture and detection delay behind the estimated head motion
+        if self.face_tracking == "predictive" and self.face_tracker.is_tracking():
+            center = self.face_tracker.predict(time.time() if timestamp is None else timestamp)
+
+            if center is not None:
+                return (int(center[0]), int(center[1]))
 
-    def get_centroid(self):
         return (self.face_centroid["center_x"], self.face_centroid["center_y"])
 
-    def _detection_worker(self):
-        while self.running:
-            try:
-                frame = self.frame_queue.get(timeout = 1.0)
-                
-                if frame is None:
-                    break
-                
-                processed_frame = self._detect_face(frame)
-                self.processed_frame = processed_frame
-            except queue.Empty:
+    def get_centroids(self, timestamp = None):
+        # One centroid per player slot, None for a slot nobody is standing in
+        if self.player_tracker is None:
+            return [self.get_centroid(timestamp)]
+
+        timestamp = time.time() if timestamp is None else timestamp
+        centroids = []
+
+        for player in range(self.max_players):
+            if self.face_tracking == "predictive":
+                center = self.player_tracker.predict(player, timestamp)
+            else:
+                box = self.player_tracker.get_box(player)
+                center = (box[0] + box[2] / 2, box[1] + box[3] / 2) if box is not None else None
+
+            centroids.append((int(center[0]), int(center[1])) if center is not None else None)
+
+        return centroids
+
+    def get_detection_result(self):
+        return self.detection_result
+
+    def get_dropped_frames(self):
+        return self.frame_ring.dropped_frames
+
+    def _capture_worker(self):
+        while self.capturing:
+            capture_size = self.capture_size_request
+
+            if capture_size is not None:
+                self._resize_capture(*capture_size)
                 continue
+
+            index, buffer = self.frame_ring.write_slot()
+
+            if index is None:
+                time.sleep(0.001)
+                continue
+
+            try:
+                with self.profiler.scope("webcam.capture"):
+                    ret, frame = self.webcam.read(buffer)
             except Exception as e:
-                print(f"Detection worker error: {e}")
+                print(f"Capture worker error: {e}")
+                ret = False
+
+            if not ret:
+                time.sleep(self.frame_interval)
+                continue
+
+            timestamp = time.time()
+            sequence = self.frame_ring.publish(index, frame, timestamp)
+
+            if self.recorder is not None:
+                self.recorder.write(frame, timestamp, sequence)
+
+    def _pool_detection_worker(self):
+        last_sequence = 0
+
+        while self.running:
+            if self.detection_pool.has_free_slot():
+                latest = self.frame_ring.wait_for_frame(last_sequence, timeout = 0.01)
+
+                if latest is not None:
+                    index, sequence, timestamp, frame = latest
+                    last_sequence = sequence
+
+                    try:
+                        self.detection_pool.submit(frame, sequence, timestamp, self.face_finder.plan_roi(self.smoothed_face))
+                    finally:
+                        self.frame_ring.release(index)
+
+                results = self.detection_pool.poll()
+            else:
+                results = self.detection_pool.poll(timeout = 0.1)
+
+            for sequence, timestamp, faces in results:
+                try:
+                    self.face_finder.report(faces)
+                    self._apply_faces(faces, sequence, timestamp)
+                    self._record_latency(timestamp)
+                    self._record_detection(faces, sequence)
+                except Exception as e:
+                    print(f"Detection worker error: {e}")
+
+    def _detection_worker(self):
+        last_sequence = 0
+
+        while self.running:
+            latest = self.frame_ring.wait_for_frame(last_sequence, timeout = 1.0)
+
+            if latest is None:
                 continue
 
-    def _detect_face(self, frame):
-        if self.face_cascade is None:
-            return frame
+            index, sequence, timestamp, frame = latest
+            last_sequence = sequence
+
+            try:
+                self._detect_face(frame, sequence, timestamp)
+            finally:
+                self.frame_ring.release(index)
+
+    def _detect_face(self, frame, sequence = 0, timestamp = 0.0):
+        if self.detector is None:
+            return None
         
         try:
-            gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
-            faces = self.face_cascade.detectMultiScale(
-                gray,
-                scaleFactor = 1.1,
-                minNeighbors = 5,
-                minSize = (32, 32),
-                maxSize = (320, 320),
-                flags = cv2.CASCADE_SCALE_IMAGE
-            )
-
-            if len(faces) > 0:
-                faces = sorted(faces, key = lambda rect: rect[2] * rect[3], reverse = True)
-                x, y, w, h = faces[0]
-                current_face = np.array([x, y, w, h])
-                self.face_history.append(current_face)
-                smoothed_face = np.mean(self.face_history, axis = 0).astype(int)
-                x_smooth, y_smooth, w_smooth, h_smooth = smoothed_face
-                center_x = x_smooth + (w_smooth // 2)
-                center_y = y_smooth + (h_smooth // 2)
-                self.face_centroid = { "center_x": int(center_x), "center_y": int(center_y) }
-                x1 = max(0, x_smooth - self.rect_padding)
-                y1 = max(0, y_smooth - self.rect_padding)
-                x2 = min(frame.shape[1], x_smooth + w_smooth + self.rect_padding)
-                y2 = min(frame.shape[0], y_smooth + h_smooth + self.rect_padding)
-                cv2.rectangle(frame, (x1, y1), (x2, y2), self.rect_color, self.rect_thickness)
-            
-            return frame
+            with self.profiler.scope("webcam.detect"):
+                faces = self.face_finder.find(frame, self.face_finder.plan_roi(self.smoothed_face))
+
+            self.face_finder.report(faces)
+            result = self._apply_faces(faces, sequence, timestamp)
+            self._record_latency(timestamp)
+            self._record_detection(faces, sequence)
+
+            return result
         except Exception as e:
             print(f"Face detection error: {e}")
-            return frame
+            return None
+
+    def _record_latency(self, timestamp):
+        # Capture to result, smoothed; frame timestamps come from time.time()
+        self.detection_latency += 0.1 * (time.time() - timestamp - self.detection_latency)
+
+    def _record_detection(self, faces, sequence):
+        # The recording pairs each frame with the face found in that same frame,
+        # before any smoothing, so it does not trail the footage
+        if self.recorder is None:
+            return
+
+        if len(faces) == 0:
+            self.recorder.report(sequence, (self.face_centroid["center_x"], self.face_centroid["center_y"]), False)
+            return
+
+        x, y, w, h, _ = max(faces, key = lambda rect: rect[2] * rect[3])
+        self.recorder.report(sequence, (x + w // 2, y + h // 2), True)
+
+    def _apply_faces(self, faces, sequence, timestamp):
+        # Results from frames captured before a resolution change are in the old pixel space
+        if sequence < self.first_valid_sequence:
+            return None
+
+        self.has_valid_face = len(faces) > 0
+
+        if self.player_tracker is not None:
+            return self._apply_players(faces, sequence, timestamp)
+
+        if len(faces) == 0:
+            self.face_tracker.miss(timestamp)
+
+            # The box stays up while the track coasts and goes once it is dropped
+            if not self.face_tracker.is_tracking():
+                self.detection_result = None
+
+            return None
+
+        faces = sorted(faces, key = lambda rect: rect[2] * rect[3], reverse = True)
+        x, y, w, h, confidence = faces[0]
+
+        if self.face_tracking == "predictive":
+            self.face_tracker.update((x, y, w, h), timestamp)
+            smoothed_face = np.array(self.face_tracker.get_box()).astype(int)
+        else:
+            self.face_history.append(np.array([x, y, w, h]))
+            smoothed_face = np.mean(self.face_history, axis = 0).astype(int)
+
+        self.smoothed_face = smoothed_face
+        x_smooth, y_smooth, w_smooth, h_smooth = smoothed_face
+        center_x = x_smooth + (w_smooth // 2)
+        center_y = y_smooth + (h_smooth // 2)
+        self.face_centroid = { "center_x": int(center_x), "center_y": int(center_y) }
+
+        # Published as one object so readers never see a box from one frame and a centroid from another
+        self.detection_result = {
+            "frame_id": sequence,
+            "timestamp": timestamp,
+            "box": (int(x_smooth), int(y_smooth), int(w_smooth), int(h_smooth)),
+            "centroid": (int(center_x), int(center_y)),
+            "confidence": float(confidence)
+        }
+
+        return self.detection_result
+
+    def _apply_players(self, faces, sequence, timestamp):
+        self.player_tracker.update(faces, timestamp)
+        players = [self.player_tracker.get_box(player) for player in range(self.max_players)]
+        players = [tuple(int(value) for value in box) if box is not None else None for box in players]
+
+        # The next detection looks at one region around everyone instead of one per player
+        bounds = self.player_tracker.get_bounds()
+        self.smoothed_face = np.array(bounds).astype(int) if bounds is not None else None
+
+        if players[0] is not None:
+            x, y, w, h = players[0]
+            self.face_centroid = { "center_x": x + w // 2, "center_y": y + h // 2 }
+
+        self.detection_result = {
+            "frame_id": sequence,
+            "timestamp": timestamp,
+            "box": players[0],
+            "centroid": (self.face_centroid["center_x"], self.face_centroid["center_y"]),
+            "confidence": max((float(face[4]) for face in faces), default = 0.0),
+            "players": players
+        }
+
+        return self.detection_result
 
     def _start_detection_thread(self):
-        if self.face_cascade is None:
+        if self.detector is None:
             return
         
         self.running = True
-        self.detection_thread = threading.Thread(target = self._detection_worker)
+        worker = self._pool_detection_worker if self.detection_pool is not None else self._detection_worker
+        self.detection_thread = threading.Thread(target = worker)
         self.detection_thread.daemon = True
         self.detection_thread.start()
 
@@ -109,12 +323,45 @@ class Webcam:
         self.running = False
 
         if self.detection_thread and self.detection_thread.is_alive():
-            self.frame_queue.put(None)
+            self.frame_ring.close()
             self.detection_thread.join(timeout = 1.0)
 
+    def _start_detection_pool(self, frame_shape):
+        if self.detector is None or self.detection_workers <= 0:
+            return
+
+        try:
+            self.detection_pool = DetectionPool(frame_shape, self.model_path, self.detector_backend, self.detection_workers, finder_options = self.finder_options)
+        except Exception as e:
+            print(f"Failed to start detection processes, using detection thread: {e}")
+            self.detection_pool = None
+
+    def _start_capture_thread(self):
+        self.capturing = True
+        self.capture_thread = threading.Thread(target = self._capture_worker)
+        self.capture_thread.daemon = True
+        self.capture_thread.start()
+
+    def _stop_capture_thread(self):
+        self.capturing = False
+
+        if self.capture_thread and self.capture_thread.is_alive():
+            self.capture_thread.join(timeout = 1.0)
+
+    def _start_recorder(self, frame_shape):
+        try:
+            self.recorder = FrameRecorder(self.record_path, frame_shape, self.fps, await_detection = self.detector is not None)
+            print(f"Recording webcam to {self.record_path}")
+        except Exception as e:
+            print(f"Failed to start webcam recording: {e}")
+            self.recorder = None
+
     def init(self):
         try:
-            self.webcam = cv2.VideoCapture(self.video_input)
+            if self.replay_path is not None:
+                self.webcam = ReplayCapture(self.replay_path, self.replay_realtime, self.replay_loop)
+            else:
+                self.webcam = cv2.VideoCapture(self.video_input)
 
             if not self.webcam.isOpened():
                 print("Webcam not detected")
@@ -127,13 +374,92 @@ class Webcam:
             if not ret:
                 print("Webcam not detected, using default background")
                 return False
+
+            # Replays start over so every run sees the recording from its first frame
+            if self.replay_path is not None:
+                self.webcam.seek(0)
+
+            if self.record_path is not None:
+                self._start_recorder(frame.shape)
             
+            self._allocate_frame_buffers(frame.shape)
+            self._start_detection_pool(frame.shape)
+            self._start_capture_thread()
             self._start_detection_thread()
             return True
         except Exception as e:
             print(f"Webcam initialization error: {e}")
             return False
         
+    def set_quality(self, quality):
+        # Returns how the capture size request went; the rest always applies
+        self.frame_interval = 1.0 / quality["background_fps"]
+
+        if self.face_finder is not None:
+            self.face_finder.detection_scale = quality["detection_scale"]
+
+        if self.detector is not None and hasattr(self.detector, "min_neighbors"):
+            self.detector.scale_factor = quality["scale_factor"]
+            self.detector.min_neighbors = quality["min_neighbors"]
+
+        return self.set_capture_size(*quality["capture_size"])
+
+    def set_capture_size(self, width, height):
+        # Only posts the request; the capture thread reconfigures the camera so the
+        # render thread never waits on the driver
+        # Returns "changed" when a resize was posted, "unchanged" when the camera is
+        # already at that size and "refused" when this capture cannot be resized
+        if (width, height) == (self.webcam_width, self.webcam_height):
+            self.capture_size_request = None
+            return "unchanged"
+
+        # Recordings, replays and worker processes are all sized for the first frame
+        if self.webcam is None or self.replay_path is not None or self.recorder is not None or self.detection_pool is not None:
+            return "refused"
+
+        self.capture_size_request = (width, height)
+
+        return "changed"
+
+    def _resize_capture(self, width, height):
+        if self.capture_size_request == (width, height):
+            self.capture_size_request = None
+
+        if (width, height) == (self.webcam_width, self.webcam_height):
+            return
+
+        try:
+            self.webcam.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            self.webcam.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            ret, frame = self.webcam.read()
+        except Exception as e:
+            print(f"Failed to change capture size: {e}")
+            return
+
+        if not ret:
+            print("Failed to change capture size: no frame after reconfiguring the camera")
+            return
+
+        # The last centroid is rescaled so the bird holds still until the next detection
+        scale_x = frame.shape[1] / self.webcam_width
+        scale_y = frame.shape[0] / self.webcam_height
+        self.face_centroid = { "center_x": int(self.face_centroid["center_x"] * scale_x), "center_y": int(self.face_centroid["center_y"] * scale_y) }
+        self.webcam_height, self.webcam_width = frame.shape[:2]
+
+        # The render thread rebuilds its crop buffers when it first sees the new shape
+        self.frame_ring.allocate(lambda: np.empty(frame.shape, dtype = np.uint8))
+        self.first_valid_sequence = self.frame_ring.sequence + 1
+        self.face_tracker.reset()
+        self.face_history.clear()
+        self.smoothed_face = None
+        self.detection_result = None
+
+        if self.player_tracker is not None:
+            self.player_tracker.reset()
+
+        if (width, height) != (self.webcam_width, self.webcam_height):
+            print(f"Camera gave {self.webcam_width}x{self.webcam_height} instead of {width}x{height}")
+
     def get_background(self):
         if self.webcam is None:
             return None
@@ -144,45 +470,118 @@ class Webcam:
         if elapsed_time < self.frame_interval and self.last_frame is not None:
             return self.last_frame
         
-        ret, frame = self.webcam.read()
+        latest = self.frame_ring.acquire_latest(self.last_frame_sequence)
 
-        if not ret:
+        if latest is None:
             return self.last_frame
+
+        index, sequence, _, frame = latest
+
+        try:
+            if frame.shape != self.crop_frame_shape:
+                self._allocate_crop_buffers(frame.shape)
+
+            self._convert_background(frame)
+        finally:
+            self.frame_ring.release(index)
+
+        self.last_frame_sequence = sequence
+        self.last_frame = self.background_surface
+        self.last_frame_time = current_time
         
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        if self.running and self.face_cascade is not None:
-            try:
-                self.frame_queue.put(frame_rgb.copy(), block = False)
-            except queue.Full:
-                pass
-            
-            if self.processed_frame is not None:
-                frame_rgb = self.processed_frame
-        
-        original_height, original_width = frame_rgb.shape[:2]
+        return self.background_surface
+
+    def _convert_background(self, frame):
+        if self.use_opencl:
+            # The Python binding can only read a UMat back into a new array, so the
+            # frame comes back at camera resolution and the upscale still writes
+            # straight into the Surface buffer instead of a full-size temporary
+            rgb = cv2.cvtColor(cv2.UMat(frame[self.crop_slice]), cv2.COLOR_BGR2RGB)
+            cv2.resize(cv2.flip(rgb, 1).get(), (self.window_width, self.window_height), dst = self.background_buffer)
+            return
+
+        cv2.cvtColor(frame[self.crop_slice], cv2.COLOR_BGR2RGB, dst = self.crop_rgb_buffer)
+        cv2.flip(self.crop_rgb_buffer, 1, dst = self.crop_mirror_buffer)
+
+        # Crop is a view, color conversion and mirroring run at camera resolution and
+        # only the final resize touches full-size memory, writing into the Surface buffer
+        cv2.resize(self.crop_mirror_buffer, (self.window_width, self.window_height), dst = self.background_buffer)
+
+    def _allocate_frame_buffers(self, frame_shape):
+        self.frame_ring.allocate(lambda: np.empty(frame_shape, dtype = np.uint8))
+        self._allocate_crop_buffers(frame_shape)
+        self.background_buffer = np.empty((self.window_height, self.window_width, 3), dtype = np.uint8)
+        self.background_surface = self.pygame.image.frombuffer(self.background_buffer, (self.window_width, self.window_height), "RGB")
+
+    def _allocate_crop_buffers(self, frame_shape):
+        original_height, original_width = frame_shape[:2]
         original_aspect = original_width / original_height
         target_aspect = self.window_height / self.window_width
         
         if original_aspect > (1.0 / target_aspect):
             crop_width = int(original_height * (1.0 / target_aspect))
             start_x = (original_width - crop_width) // 2
-            cropped_frame = frame_rgb[:, start_x:start_x + crop_width]
+            self.crop_slice = (slice(None), slice(start_x, start_x + crop_width))
+            self.crop_origin = (start_x, 0)
+            crop_height = original_height
         else:
             crop_height = int(original_width * target_aspect)
             start_y = (original_height - crop_height) // 2
-            cropped_frame = frame_rgb[start_y:start_y + crop_height, :]
-        
-        rotated_frame = cv2.rotate(cropped_frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
-        resized_frame = cv2.resize(rotated_frame, (self.window_height, self.window_width))
-        background = self.pygame.surfarray.make_surface(resized_frame)
-        self.last_frame = background
-        self.last_frame_time = current_time
-        
-        return background
+            self.crop_slice = (slice(start_y, start_y + crop_height), slice(None))
+            self.crop_origin = (0, start_y)
+            crop_width = original_width
+
+        self.crop_size = (crop_width, crop_height)
+        self.crop_frame_shape = tuple(frame_shape)
+        self.crop_rgb_buffer = np.empty((crop_height, crop_width, 3), dtype = np.uint8)
+        self.crop_mirror_buffer = np.empty((crop_height, crop_width, 3), dtype = np.uint8)
     
+    def draw_overlay(self, screen):
+        result = self.detection_result
+
+        if result is None or self.crop_size[0] == 0:
+            return
+
+        if "players" not in result:
+            self._draw_box(screen, result["box"], self.rect_color)
+            return
+
+        for player, box in enumerate(result["players"]):
+            if box is not None:
+                self._draw_box(screen, box, self.player_colors[player % len(self.player_colors)] if self.player_colors else self.rect_color)
+
+    def _draw_box(self, screen, box, color):
+        # Map the camera-space box through the crop, the horizontal mirror and the
+        # upscale so it lines up with the background drawn by get_background
+        scale = self.window_width / self.crop_size[0]
+        x, y, w, h = box
+        x1 = max(0, x - self.rect_padding - self.crop_origin[0])
+        y1 = max(0, y - self.rect_padding - self.crop_origin[1])
+        x2 = min(self.crop_size[0], x + w + self.rect_padding - self.crop_origin[0])
+        y2 = min(self.crop_size[1], y + h + self.rect_padding - self.crop_origin[1])
+
+        if x2 <= x1 or y2 <= y1:
+            return
+
+        rect = self.pygame.Rect(
+            int((self.crop_size[0] - x2) * scale),
+            int(y1 * scale),
+            int((x2 - x1) * scale),
+            int((y2 - y1) * scale)
+        )
+        self.pygame.draw.rect(screen, color, rect, max(1, int(self.rect_thickness * scale)))
+
     def destroy_all(self):
+        self._stop_capture_thread()
         self._stop_detection_thread()
+
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+        if self.detection_pool is not None:
+            self.detection_pool.close()
+            self.detection_pool = None
         
         if self.webcam is not None:
             self.webcam.release()
@@ -1,25 +1,32 @@
+import time
+
+STARTUP_BEGIN = time.perf_counter()
+
 import pygame
 import sys
-import random
+import argparse
 import os
-from lib.bird import Bird
-from lib.pipe import Pipe
-from lib.ground import Ground
 from lib.button import Button
-from lib.webcam import Webcam
 from lib.sound import SoundManager
-
-pygame.init()
-pygame.mixer.init()
+from lib.sprite_cache import SpriteCache
+from lib.rotation_atlas import RotationAtlas
+from lib.collision import CollisionEngine
+from lib.profiler import Profiler
+from lib.game_state import GameState
+from lib.renderer import Renderer
+from lib.text_cache import TextCache
+from lib.asset_loader import AssetLoader
+from lib.startup_timer import StartupTimer
+from lib.quality_governor import QualityGovernor, QUALITY_LEVELS
+from lib.session import Session, SessionRecorder
+
+IMPORTS_DONE = time.perf_counter()
 
 GLOBAL_SCREEN_WIDTH = 1920
 GLOBAL_SCREEN_HEIGHT = 1080
 SCREEN_WIDTH = GLOBAL_SCREEN_WIDTH
 SCREEN_HEIGHT = GLOBAL_SCREEN_HEIGHT
 
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.HWSURFACE | pygame.DOUBLEBUF)
-pygame.display.set_caption("Flappy Bird CV")
-
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 GREEN = (0, 128, 0)
@@ -34,104 +41,256 @@ GRASS_DARK_GREEN = (134, 215, 68)
 GROUND_DARK_YELLOW = (211, 244, 98)
 BIRD_DARK_RED = (178, 49, 28)
 
+PLAYER_COLORS = [BIRD_RED, GRASS_GREEN, (66, 135, 245), (245, 205, 66)]
+
 PIPE_MIN_Y = 320
 PIPE_MAX_Y = 860
 PIPE_MIN_Y = max(200, PIPE_MIN_Y)
-PIPE_MAX_Y = min(SCREEN_HEIGHT - 200, PIPE_MAX_Y)\
+PIPE_MAX_Y = min(SCREEN_HEIGHT - 200, PIPE_MAX_Y)
+PIPE_WIDTH = 78
+PIPE_HEIGHT = 1080
+BIRD_ANGLE_STEP = 2
+UPDATE_RATE = 60
+UPDATE_STEP = 1 / UPDATE_RATE
+MAX_UPDATE_LAG = 0.25
+
+sprite_cache = SpriteCache(pygame)
+collision_engine = CollisionEngine(pygame)
+text_cache = TextCache()
 
 def load_font(font_path, font_name = "PixelifySans", font_style = "Regular"):
     return os.path.join(font_path, f"{font_name}-{font_style}.ttf")
 
-def create_placeholder_sounds():
-    sounds = {}
-    jump_sound = pygame.mixer.Sound(buffer = bytes([0] * 44))
-    sounds["beep"] = jump_sound
-    sounds["button"] = jump_sound
-    sounds["lose"] = jump_sound
-    sounds["point"] = jump_sound
-    sounds["backsound"] = jump_sound
+def init_display():
+    # Only what the first frame needs; the mixer starts on the loader with the sounds
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.HWSURFACE | pygame.DOUBLEBUF)
+    pygame.display.set_caption("Flappy Bird CV")
 
-    return sounds
+    return screen
 
-def load_assets():
+def create_placeholder_assets():
     assets = {}
-    asset_path = "assets/images"
 
-    sounds = {}
-    sound_path = "assets/sounds"
+    assets["bg"] = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    assets["bg"].fill((135, 206, 235))
+
+    placeholder = pygame.Surface((50, 35), pygame.SRCALPHA)
+    pygame.draw.ellipse(placeholder, YELLOW, (0, 0, 50, 35))
+    pygame.draw.ellipse(placeholder, BLACK, (35, 10, 10, 10))
+    pygame.draw.polygon(placeholder, RED, [(50, 17), (60, 12), (60, 22)])
+    assets["bird_frames"] = [placeholder]
+    assets["bird_atlas"] = RotationAtlas(assets["bird_frames"], pygame, BIRD_ANGLE_STEP)
+    assets["bird_images"] = {}
 
+    assets["pipe"] = pygame.Surface((80, 500), pygame.SRCALPHA)
+    pygame.draw.rect(assets["pipe"], GREEN, (0, 0, 80, 500))
+    pygame.draw.rect(assets["pipe"], (0, 100, 0), (0, 0, 80, 500), 3)
+
+    assets["ground"] = pygame.Surface((SCREEN_WIDTH, 100))
+    assets["ground"].fill((222, 184, 135))
+
+    sprite_cache.sync((SCREEN_WIDTH, SCREEN_HEIGHT), { "pipe": assets["pipe"] })
+    assets["pipe_sprites"] = sprite_cache.get_pipe_sprites(assets["pipe"], PIPE_WIDTH, PIPE_HEIGHT)
+
+    return assets
+
+def load_assets(loader):
+    asset_path = "assets/images"
+    sound_path = "assets/sounds"
     font_path = "assets/fonts"
     model_path = "assets/models"
-    
-    try:
-        assets["bg"] = pygame.image.load(os.path.join(asset_path, "bg.png")).convert()
-        assets["bg"] = pygame.transform.scale(assets["bg"], (SCREEN_WIDTH, SCREEN_HEIGHT))
-        sounds["beep"] = pygame.mixer.Sound(os.path.join(sound_path, "beep.mp3"))
-        sounds["button"] = pygame.mixer.Sound(os.path.join(sound_path, "button.mp3"))
-        sounds["lose"] = pygame.mixer.Sound(os.path.join(sound_path, "lose.mp3"))
-        sounds["point"] = pygame.mixer.Sound(os.path.join(sound_path, "point.mp3"))
-        sounds["backsound"] = pygame.mixer.Sound(os.path.join(sound_path, "backsound.mp3"))
-    except FileNotFoundError:
-        print("Failed to load background image, using green background")
 
-        assets["bg"] = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        assets["bg"].fill((135, 206, 235))
-        sounds = create_placeholder_sounds()
-    
-    bird_frames = []
+    # The game starts on placeholders; each asset replaces its placeholder as soon
+    # as the loader hands it back
+    loader.image("bg", os.path.join(asset_path, "bg.png"), (SCREEN_WIDTH, SCREEN_HEIGHT))
+    loader.image("pipe", os.path.join(asset_path, "pipe.png"), (80, 500), alpha = True)
+    loader.image("ground", os.path.join(asset_path, "ground.png"), (SCREEN_WIDTH, 100))
 
     for i in range(1, 4):
-        try:
-            frame = pygame.image.load(os.path.join(asset_path, f"bird{i}.png")).convert_alpha()
-            frame = pygame.transform.scale(frame, (50, 35))
-            bird_frames.append(frame)
-        except FileNotFoundError:
-            print("Failed to load bird image animation")
-    
-    if not bird_frames:
-        placeholder = pygame.Surface((50, 35), pygame.SRCALPHA)
-        pygame.draw.ellipse(placeholder, YELLOW, (0, 0, 50, 35))
-        pygame.draw.ellipse(placeholder, BLACK, (35, 10, 10, 10))
-        pygame.draw.polygon(placeholder, RED, [(50, 17), (60, 12), (60, 22)])
-        bird_frames = [placeholder]
-    
-    assets["bird_frames"] = bird_frames
+        loader.image(f"bird{i}", os.path.join(asset_path, f"bird{i}.png"), (50, 35), alpha = True)
 
-    try:
-        assets["pipe"] = pygame.image.load(os.path.join(asset_path, "pipe.png")).convert_alpha()
-        assets["pipe"] = pygame.transform.scale(assets["pipe"], (80, 500))
-    except FileNotFoundError:
-        print("Failed to load pipe, creating pipe placeholder")
+    for name in ["beep", "button", "lose", "point", "backsound"]:
+        loader.sound(f"sound/{name}", os.path.join(sound_path, f"{name}.mp3"))
 
-        assets["pipe"] = pygame.Surface((80, 500), pygame.SRCALPHA)
-        pygame.draw.rect(assets["pipe"], GREEN, (0, 0, 80, 500))
-        pygame.draw.rect(assets["pipe"], (0, 100, 0), (0, 0, 80, 500), 3)
-    
-    try:
-        assets["ground"] = pygame.image.load(os.path.join(asset_path, "ground.png")).convert()
-        assets["ground"] = pygame.transform.scale(assets["ground"], (SCREEN_WIDTH, 100))
-    except FileNotFoundError:
-        print("Failed to load pipe, creating pipe placeholder")
+    return font_path, model_path
 
-        assets["ground"] = pygame.Surface((SCREEN_WIDTH, 100))
-        assets["ground"].fill((222, 184, 135))
-    
-    return assets, sounds, font_path, model_path
+def apply_loaded_assets(loaded, assets, game, sound_manager):
+    redraw = False
+
+    for name, value in loaded.items():
+        if name.startswith("sound/"):
+            sound_manager.replace(name[len("sound/"):], value)
+        elif name.startswith("bird"):
+            assets["bird_images"][name] = value
+        elif name in ("bg", "pipe", "ground"):
+            assets[name] = value
+            redraw = True
+
+    if any(name.startswith("bird") for name in loaded):
+        assets["bird_frames"] = [assets["bird_images"][name] for name in sorted(assets["bird_images"])]
+        assets["bird_atlas"] = RotationAtlas(assets["bird_frames"], pygame, BIRD_ANGLE_STEP)
+        game.bird_frames = assets["bird_frames"]
+        game.bird_atlas = assets["bird_atlas"]
+
+        for bird in game.birds:
+            bird.frames = assets["bird_frames"]
+            bird.atlas = assets["bird_atlas"]
+            bird.current_frame %= len(assets["bird_frames"])
+        redraw = True
+
+    if "pipe" in loaded:
+        sprite_cache.sync((SCREEN_WIDTH, SCREEN_HEIGHT), { "pipe": assets["pipe"] })
+        assets["pipe_sprites"] = sprite_cache.get_pipe_sprites(assets["pipe"], PIPE_WIDTH, PIPE_HEIGHT)
+        game.pipe_sprites = game.pipes.sprites = assets["pipe_sprites"]
+
+    if "ground" in loaded:
+        game.ground_img = game.ground.image = assets["ground"]
+
+    return redraw
+
+def start_webcam(args, profiler, model_path, startup_timer):
+    # Imported here so cv2 and numpy load on the loader thread instead of delaying the window
+    from lib.webcam import Webcam
+    startup_timer.mark("cv2 and numpy imported", "camera")
+
+    webcam = Webcam(os.path.join(model_path, "haarcascade_frontalface_alt.xml"), GLOBAL_SCREEN_WIDTH, GLOBAL_SCREEN_HEIGHT, BIRD_RED, 2, 2, 15, pygame, detector_backend = args.detector, detection_workers = args.detection_workers, profiler = profiler,
+        record_path = args.record, replay_path = args.replay, replay_realtime = not args.replay_unthrottled,
+        face_tracking = args.face_tracking, prediction_lead = args.prediction_lead, max_players = args.players, player_colors = PLAYER_COLORS, opencl = args.opencl)
+    startup_timer.mark("face detector loaded", "camera")
+
+    webcam_init = webcam.init()
+    startup_timer.mark("camera opened" if webcam_init else "camera unavailable", "camera")
+
+    return webcam, webcam_init
+
+def create_ghost_atlas(frames):
+    # Ghost birds are the player's sprites at reduced opacity; the masks stay those of
+    # the opaque sprites, since faded pixels fall under the mask alpha threshold
+    ghost_frames = [fade_sprite(frame) for frame in frames]
+    atlas = RotationAtlas(frames, pygame, BIRD_ANGLE_STEP)
+
+    for entries in atlas.entries:
+        for i, (rotated, mask, offset) in enumerate(entries):
+            entries[i] = (fade_sprite(rotated), mask, offset)
+
+    return ghost_frames, atlas
+
+def fade_sprite(sprite, alpha = 110):
+    faded = sprite.copy()
+    faded.fill((255, 255, 255, alpha), special_flags = pygame.BLEND_RGBA_MULT)
+
+    return faded
+
+def draw_scene(target, game, game_started, alpha = 1.0, label_font = None, ghost = None):
+    rects = []
+
+    if game_started:
+        for pipe in game.pipes:
+            rects.extend(pipe.draw(target, alpha = alpha))
+
+    rects.extend(game.ground.draw(target, alpha))
+
+    if game_started and ghost is not None:
+        for i, bird in enumerate(ghost.birds):
+            if ghost.alive[i]:
+                rects.append(bird.draw(target, alpha))
+
+    for i, bird in enumerate(game.birds):
+        # Birds that crashed leave the race; once everyone has, the final scene shows them all
+        if not game.alive[i] and not game.game_over:
+            continue
+
+        bird_rect = bird.draw(target, alpha)
+        rects.append(bird_rect)
+
+        # With several players each bird carries its player's tag above it
+        if game.players > 1 and label_font is not None:
+            label = text_cache.render(label_font, f"P{i + 1}", PLAYER_COLORS[i % len(PLAYER_COLORS)])
+            rects.append(target.blit(label, (bird_rect.centerx - label.get_width() // 2, bird_rect.top - label.get_height())))
+
+    return rects
+
+def draw_scores(target, game, font):
+    if game.players == 1:
+        return [text_cache.blit_number(target, font, "SCORE: ", game.score, GROUND_DARK_YELLOW, (32, 16))]
+
+    return [
+        text_cache.blit_number(target, font, f"P{i + 1}: ", score, PLAYER_COLORS[i % len(PLAYER_COLORS)], (32 + i * 220, 16))
+        for i, score in enumerate(game.scores)
+    ]
+
+def draw_menu_backdrop(target, renderer, game, game_started, screen_state, title_font, text_font, scene_drawn = False):
+    if not scene_drawn:
+        draw_scene(target, game, game_started)
+
+    renderer.dim(target)
+
+    if screen_state == "menu":
+        title_text = text_cache.render(title_font, "FLAPPY BIRD CV", WHITE)
+        target.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 3))
+    else:
+        game_over_text = text_cache.render(title_font, "GAME OVER", BIRD_RED)
+        target.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 3))
+
+        if game.players == 1:
+            final_score_text = text_cache.render(text_font, f"SCORE: {game.score}", GROUND_DARK_YELLOW)
+            target.blit(final_score_text, (SCREEN_WIDTH // 2 - final_score_text.get_width() // 2, SCREEN_HEIGHT // 2.3))
+        else:
+            score_texts = [text_cache.render(text_font, f"P{i + 1}: {score}", PLAYER_COLORS[i % len(PLAYER_COLORS)]) for i, score in enumerate(game.scores)]
+            spacing = 40
+            x = SCREEN_WIDTH // 2 - (sum(text.get_width() for text in score_texts) + spacing * (len(score_texts) - 1)) // 2
+
+            for score_text in score_texts:
+                target.blit(score_text, (x, SCREEN_HEIGHT // 2.3))
+                x += score_text.get_width() + spacing
+
+def parse_args():
+    parser = argparse.ArgumentParser(description = "Flappy Bird CV")
+    parser.add_argument("--detector", default = None, help = "Face detector backend, e.g. haar:frontalface_default, dnn or ultralytics")
+    parser.add_argument("--detection-workers", type = int, default = 0, help = "Run face detection in this many worker processes")
+    parser.add_argument("--face-tracking", default = "predictive", choices = ["predictive", "average"], help = "Predict the face position at render time, or average the last detections")
+    parser.add_argument("--prediction-lead", type = float, default = 0.0, help = "Extra seconds to predict ahead to cover camera latency")
+    parser.add_argument("--opencl", default = "auto", choices = ["auto", "on", "off"], help = "Run camera preprocessing and Haar detection through OpenCL when a device is available")
+    parser.add_argument("--players", type = int, default = 1, choices = [1, 2, 3, 4], help = "Number of players sharing the camera, one bird per face")
+    parser.add_argument("--startup-report", action = "store_true", help = "Print how long each startup phase took once loading finishes")
+    parser.add_argument("--quality", default = "auto", choices = ["auto"] + [quality["name"] for quality in QUALITY_LEVELS], help = "Camera and detection quality; auto adapts it to hold the frame rate")
+    parser.add_argument("--quality-log", default = None, help = "Write every quality change to this .jsonl file")
+    parser.add_argument("--fps", type = int, default = 60, help = "Render frame rate cap, e.g. 144 for high refresh displays or 0 for uncapped")
+    parser.add_argument("--profile", action = "store_true", help = "Time each phase of the main loop; F3 toggles the on-screen HUD")
+    parser.add_argument("--profile-log", default = None, help = "Write per-frame timings to a .csv or .jsonl file (implies --profile)")
+    parser.add_argument("--record", default = None, help = "Record webcam frames and face centroids into this directory")
+    parser.add_argument("--replay", default = None, help = "Play back a recording made with --record instead of opening the webcam")
+    parser.add_argument("--sessions", default = None, help = "Save every finished game as a replayable session file in this directory")
+    parser.add_argument("--ghost", default = None, help = "Race against a ghost replaying this session file, on the same pipes")
+    parser.add_argument("--replay-unthrottled", action = "store_true", help = "Feed replayed frames as fast as they are consumed instead of at recorded speed")
+
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    assets, sounds, font_path, model_path = load_assets()
+    args = parse_args()
+    startup_timer = StartupTimer(STARTUP_BEGIN)
+    startup_timer.mark("imports", timestamp = IMPORTS_DONE)
+    screen = init_display()
+    startup_timer.mark("window opened")
+    profiler = Profiler(args.profile or args.profile_log is not None, log_path = args.profile_log, pygame = pygame)
+    asset_loader = AssetLoader(pygame)
+    assets = create_placeholder_assets()
+    font_path, model_path = load_assets(asset_loader)
     clock = pygame.time.Clock()
     score_font, game_over_font, start_font, global_font = None, None, None, None
-    webcam = Webcam(os.path.join(model_path, "haarcascade_frontalface_alt.xml"), GLOBAL_SCREEN_WIDTH, GLOBAL_SCREEN_HEIGHT, BIRD_RED, 2, 2, 15, pygame)
+    # Opening the camera and loading the face detector are the slowest part of
+    # startup, so they also run on the loader while the menu is already up
+    asset_loader.task("webcam", start_webcam, args, profiler, model_path, startup_timer)
+    webcam = None
+    webcam_init = False
     use_webcam_bg = False
-    webcam_init = webcam.init()
-    sound_manager = SoundManager(sounds)
-
-    if not webcam_init:
-        print("Webcam not detected, using default background")
-        use_webcam_bg = False
-    else:
-        use_webcam_bg = True
+    sound_manager = SoundManager({}, pygame)
+    # Sounds are only started and stopped when the screen changes, not every frame
+    sound_manager.add_state("menu", keep = ["backsound", "button"], start = [("backsound", True)])
+    sound_manager.add_state("playing", keep = ["backsound", "beep", "button"])
+    sound_manager.add_state("game_over", keep = ["lose", "button"], start = [("lose", False)])
     
     try:
         score_font = pygame.font.Font(load_font(font_path, "PixelifySans", "Regular"), 32)
@@ -143,162 +302,270 @@ if __name__ == "__main__":
         game_over_font = pygame.font.SysFont("Arial", 56)
         start_font = pygame.font.SysFont("Arial", 32)
         global_font = pygame.font.SysFont("Arial", 36)
+
+    profiler_font = pygame.font.SysFont("monospace", 18)
     
-    def init_game():
-        bird = Bird(100, SCREEN_HEIGHT // 2, assets["bird_frames"], pygame)
-        ground = Ground(SCREEN_WIDTH, SCREEN_HEIGHT - 100, assets["ground"], pygame)
-        pipes = []
-        score = 0
-        game_over = False
-        game_started = False
-        
-        return bird, ground, pipes, score, game_over, game_started
-    
-    bird, ground, pipes, score, game_over, game_started = init_game()
+    game = GameState(
+        pygame,
+        screen_width = SCREEN_WIDTH,
+        screen_height = SCREEN_HEIGHT,
+        pipe_min_y = PIPE_MIN_Y,
+        pipe_max_y = PIPE_MAX_Y,
+        bird_frames = assets["bird_frames"],
+        bird_atlas = assets["bird_atlas"],
+        ground_img = assets["ground"],
+        pipe_sprites = assets["pipe_sprites"],
+        pipe_width = PIPE_WIDTH,
+        pipe_height = PIPE_HEIGHT,
+        step_ms = UPDATE_STEP * 1000,
+        collision_engine = collision_engine,
+        profiler = profiler,
+        players = args.players
+    )
+    game_started = False
+    ghost_session = None
+    ghost = None
+    ghost_targets = None
+
+    if args.ghost is not None:
+        try:
+            ghost_session = Session(args.ghost)
+            # Live games reuse the ghost's seed so both fly through the same pipes
+            game.reset(ghost_session.seed)
+            ghost = GameState(pygame, collision_engine = collision_engine, **ghost_session.game_options())
+        except (OSError, ValueError) as e:
+            print(f"Failed to load ghost session: {e}")
+            ghost_session = None
     restart_button = Button(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 60, 200, 60, "RESTART", GRASS_GREEN, GRASS_DARK_GREEN, global_font, pygame)
     start_button = Button(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 40, 200, 60, "START", GRASS_GREEN, GRASS_DARK_GREEN, start_font, pygame)
     quit_button = Button(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 150, 200, 60, "QUIT", BIRD_RED, BIRD_DARK_RED, start_font, pygame)
-    pipe_spawn_timer = 0
-    pipe_spawn_interval = max(1500,2500 - score * 20)
+    renderer = Renderer(pygame, screen)
+    # Trades camera and detection quality against the frame budget once the camera is up
+    governor = QualityGovernor(args.fps or UPDATE_RATE, "normal" if args.quality == "auto" else args.quality, args.quality == "auto", log_path = args.quality_log)
+    last_screen_state = None
+    last_update_time = time.perf_counter()
+    update_lag = 0.0
+    menu_layer = None
+    first_frame_shown = False
     running = True
     blink_interval = 500
     instruction_visible = True
     last_blink_tim = 0
 
     while running:
-        current_time = pygame.time.get_ticks()
+        frame_start = time.perf_counter()
+        # pygame.time.get_ticks needs the full pygame.init, which would also open the mixer
+        current_time = int(frame_start * 1000)
         mouse_pos = pygame.mouse.get_pos()
 
+        if not asset_loader.is_done():
+            loaded = asset_loader.poll()
+
+            if "webcam" in loaded:
+                webcam, webcam_init = loaded.pop("webcam")
+                use_webcam_bg = webcam_init
+
+                if webcam_init:
+                    governor.attach(webcam)
+
+                if not webcam_init:
+                    print("Webcam not detected, using default background")
+
+            if any(name.startswith("sound/") for name in loaded) and not sound_manager.sounds:
+                startup_timer.mark("audio ready")
+
+            if apply_loaded_assets(loaded, assets, game, sound_manager):
+                menu_layer = None
+                renderer.invalidate()
+
+            if asset_loader.is_done():
+                startup_timer.mark("assets loaded")
+
         if current_time - last_blink_tim > blink_interval:
             instruction_visible = not instruction_visible
             last_blink_tim = current_time
         
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
+        with profiler.scope("input"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    profiler.toggle_hud()
             
-            if not game_over:
-                if not game_started:
-                    start_button.check_hover(mouse_pos)
+                if not game.game_over:
+                    if not game_started:
+                        start_button.check_hover(mouse_pos)
+                        quit_button.check_hover(mouse_pos)
+
+                        if start_button.is_clicked(mouse_pos, event):
+                            sound_manager.play_timeout("button", volume = 0.7, loop = False, timeout = 1)
+                            game_started = True
+
+                            if args.sessions is not None:
+                                game.recorder = SessionRecorder(game)
+
+                            if ghost is not None:
+                                ghost.bird_frames, ghost.bird_atlas = create_ghost_atlas(assets["bird_frames"])
+                                ghost.reset()
+                                ghost_targets = ghost_session.targets()
+                        if quit_button.is_clicked(mouse_pos, event):
+                            sound_manager.play_timeout("button", volume = 0.7, loop = False, timeout = 1)
+                            running = False
+                else:
+                    restart_button.check_hover(mouse_pos)
                     quit_button.check_hover(mouse_pos)
 
-                    if start_button.is_clicked(mouse_pos, event):
+                    if restart_button.is_clicked(mouse_pos, event):
                         sound_manager.play_timeout("button", volume = 0.7, loop = False, timeout = 1)
-                        game_started = True
+                        game.reset()
+                        game_started = False
+
                     if quit_button.is_clicked(mouse_pos, event):
                         sound_manager.play_timeout("button", volume = 0.7, loop = False, timeout = 1)
                         running = False
-            else:
-                restart_button.check_hover(mouse_pos)
-                quit_button.check_hover(mouse_pos)
-
-                if restart_button.is_clicked(mouse_pos, event):
-                    sound_manager.play_timeout("button", volume = 0.7, loop = False, timeout = 1)
-                    bird, ground, pipes, score, game_over, game_started = init_game()
-
-                if quit_button.is_clicked(mouse_pos, event):
-                    sound_manager.play_timeout("button", volume = 0.7, loop = False, timeout = 1)
-                    running = False
-        
-        if not game_over and game_started:
-            face_center = webcam.get_centroid()
-            
-            if face_center is not None:
-                center_x, center_y = face_center
-                game_height = SCREEN_HEIGHT
-                bird_y = (center_y / webcam.webcam_height) * game_height
-                bird_y = max(0, min(bird_y, SCREEN_HEIGHT))
-                bird.set_position(int(bird_y))
         
-        if not game_over and game_started:
-            bird.update()
-            ground.update()
-            sound_manager.stop_all_except(["backsound", "beep", "button"])
-
-            if current_time - pipe_spawn_timer > pipe_spawn_interval:
-                gap_height = random.randint(PIPE_MIN_Y, PIPE_MAX_Y)
-                pipes.append(Pipe(SCREEN_WIDTH, SCREEN_HEIGHT, gap_height, pygame))
-                pipe_spawn_timer = current_time
+        if not game.game_over and game_started:
+            target_y = None
+
+            # One target per player; a player the camera has lost keeps their bird where it is
+            if webcam is not None:
+                target_y = [(center[1] / webcam.webcam_height) * SCREEN_HEIGHT if center is not None else None for center in webcam.get_centroids()]
             
-            for pipe in pipes[:]:
-                pipe.update()
-                
-                if not pipe.passed and pipe.x + 80 < bird.x:
-                    pipe.passed = True
-                    score += 1
+            with profiler.scope("update"):
+                # The simulation advances in fixed steps however long the frame took;
+                # a long stall is clamped so the game does not jump ahead all at once
+                update_lag += min(frame_start - last_update_time, MAX_UPDATE_LAG)
+                scored = 0
+
+                while update_lag >= UPDATE_STEP and not game.game_over:
+                    scored += game.step(target_y)
+                    update_lag -= UPDATE_STEP
+
+                    if ghost is not None and not ghost.game_over:
+                        if ghost.frame < ghost_session.steps:
+                            ghost.step(next(ghost_targets, None))
+                        else:
+                            # The recorded run ends here, so the ghost does too
+                            ghost.alive = [False] * ghost.players
+                            ghost.game_over = True
+
+                if scored:
                     sound_manager.play_timeout("beep", volume = 0.75, loop = False, timeout = 1)
-                
-                if pipe.x + 80 < 0:
-                    pipes.remove(pipe)
-            
-            for pipe in pipes:
-                if pipe.collide(bird):
-                    game_over = True
-            
-            if ground.collide(bird):
-                game_over = True
-        
-        if use_webcam_bg and webcam_init:
-            webcam_bg = webcam.get_background()
+        else:
+            update_lag = 0.0
 
-            if webcam_bg is not None:
-                screen.blit(webcam_bg, (0, 0))
-            else:
-                screen.blit(assets["bg"], (0, 0))
+        # Sprites are drawn between the last two simulation steps by however far
+        # the clock has moved past the last one
+        last_update_time = frame_start
+        alpha = min(1.0, update_lag / UPDATE_STEP) if game_started and not game.game_over else 1.0
+
+        if game.game_over:
+            screen_state = "game_over"
+        elif game_started:
+            screen_state = "playing"
         else:
-            screen.blit(assets["bg"], (0, 0))
-        
-        if game_started:
-            for pipe in pipes:
-                pipe.draw(screen, assets["pipe"])
+            screen_state = "menu"
+
+        if screen_state != last_screen_state:
+            if screen_state == "game_over" and game.recorder is not None:
+                session_path = os.path.join(args.sessions, f"{time.strftime('%Y%m%d-%H%M%S')}-{game.score}.fcs")
+
+                try:
+                    game.recorder.save(session_path, game)
+                    print(f"Session saved to {session_path}")
+                except OSError as e:
+                    print(f"Failed to save session: {e}")
+
+                game.recorder = None
+
+            menu_layer = None
+            renderer.invalidate()
+            sound_manager.enter_state(screen_state)
+            last_screen_state = screen_state
+
+        sound_manager.update(frame_start)
+
+        with profiler.scope("background"):
+            webcam_bg = None
+
+            if use_webcam_bg and webcam_init:
+                webcam_bg = webcam.get_background()
+
+            # Without the camera feed nothing behind the sprites changes, so only the
+            # rects that moved are redrawn; the HUD is not tracked and forces full frames
+            static = webcam_bg is None and not profiler.hud_visible
+
+            if static and screen_state != "playing":
+                # The scene is frozen behind menus, so compose it with the dim and titles once
+                if menu_layer is None:
+                    menu_layer = renderer.compose(assets["bg"], lambda layer: draw_menu_backdrop(layer, renderer, game, game_started, screen_state, game_over_font, global_font))
 
-        ground.draw(screen)
-        bird.draw(screen)
+                renderer.begin_frame(menu_layer, static = True)
+            else:
+                renderer.begin_frame(webcam_bg if webcam_bg is not None else assets["bg"], static)
+
+                if webcam_bg is not None:
+                    webcam.draw_overlay(screen)
+
+        with profiler.scope("scene"):
+            if screen_state == "playing" or not static:
+                renderer.mark(*draw_scene(screen, game, game_started, alpha, score_font, ghost))
         
-        if game_started:
-            score_text = global_font.render(f"SCORE: {score}", True, GROUND_DARK_YELLOW)
-            screen.blit(score_text, (32, 16))
+        with profiler.scope("text"):
+            if screen_state == "playing":
+                renderer.mark(*draw_scores(screen, game, global_font))
         
-        if not game_started and not game_over:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 128))
-            screen.blit(overlay, (0, 0))
-            
-            title_text = game_over_font.render("FLAPPY BIRD CV", True, WHITE)
-            screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, SCREEN_HEIGHT // 3))
-            
-            if instruction_visible:
-                instruction_text = global_font.render("Click START to play", True, GRASS_GREEN)
-                screen.blit(instruction_text, (SCREEN_WIDTH // 2 - instruction_text.get_width() // 2, SCREEN_HEIGHT // 2 - 60))
-
-            start_button.draw(screen, BLACK)
-            quit_button.draw(screen, BLACK)
+        with profiler.scope("menus"):
+            if screen_state != "playing" and not static:
+                # The scene scope already drew the scene this frame, only the dim and titles go on top
+                draw_menu_backdrop(screen, renderer, game, game_started, screen_state, game_over_font, global_font, scene_drawn = True)
+
+            if screen_state == "menu":
+                if instruction_visible:
+                    instruction_text = text_cache.render(global_font, "Click START to play", GRASS_GREEN)
+                    renderer.mark(screen.blit(instruction_text, (SCREEN_WIDTH // 2 - instruction_text.get_width() // 2, SCREEN_HEIGHT // 2 - 60)))
+
+                renderer.mark(start_button.draw(screen, BLACK))
+                renderer.mark(quit_button.draw(screen, BLACK))
+        
+            if screen_state == "game_over":
+                renderer.mark(restart_button.draw(screen, BLACK))
+                renderer.mark(quit_button.draw(screen, BLACK))
 
-            sound_manager.stop_all_except(["backsound", "button"])
-            sound_manager.play("backsound", loop = True)
+            if webcam is None:
+                warming_text = text_cache.render(global_font, "Camera warming up...", WHITE)
+                renderer.mark(screen.blit(warming_text, (SCREEN_WIDTH // 2 - warming_text.get_width() // 2, SCREEN_HEIGHT - 160)))
         
-        if game_over:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 128))
-            screen.blit(overlay, (0, 0))
-            
-            game_over_text = game_over_font.render("GAME OVER", True, BIRD_RED)
-            screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 3))
-            
-            final_score_text = global_font.render(f"SCORE: {score}", True, GROUND_DARK_YELLOW)
-            screen.blit(final_score_text, (SCREEN_WIDTH // 2 - final_score_text.get_width() // 2, SCREEN_HEIGHT // 2.3))
+        profiler.draw_hud(screen, profiler_font)
 
-            restart_button.draw(screen, BLACK)
+        with profiler.scope("flip"):
+            renderer.end_frame()
 
+        if not first_frame_shown:
+            startup_timer.mark("first frame")
+            first_frame_shown = True
 
-            quit_button.draw(screen, BLACK)
+        if args.startup_report and not startup_timer.reported and asset_loader.is_done():
+            startup_timer.report()
 
-            sound_manager.stop_all_except(["lose", "button"])
-            sound_manager.play("lose")
-        
-        pygame.display.flip()
-        clock.tick(60)
+        frame_time = time.perf_counter() - frame_start
+        profiler.record("frame", frame_time)
+        governor.update(frame_time, frame_start)
+
+        with profiler.scope("idle"):
+            clock.tick(args.fps)
+
+        profiler.end_frame()
     
-    webcam.destroy_all()
+    if webcam is None:
+        webcam, webcam_init = asset_loader.poll(wait = True).get("webcam", (None, False))
+
+    asset_loader.shutdown()
+
+    if webcam is not None:
+        webcam.destroy_all()
+    governor.close()
+    profiler.close()
     pygame.quit()
     sys.exit()
\ No newline at end of file
@@ -21,7 +21,12 @@ help() {
     echo -e "Using: ./run.sh [COMMAND]\n"
 
     echo "Commands:"
-    echo "  start   : Run the program [Ex: ./run.sh start]"
+    echo "  start   : Run the program [Ex: ./run.sh start --detector haar:frontalface_default]"
+    echo "  bench   : Benchmark face detectors on a recorded clip [Ex: ./run.sh bench clip.mp4 --backends all]"
+    echo "  simbench: Benchmark headless game logic throughput [Ex: ./run.sh simbench --games 500]"
+    echo "  batchsim: Simulate many games at once for difficulty tuning [Ex: ./run.sh batchsim --gap-size 160 200]"
+    echo "  oclbench: Compare the numpy and OpenCL webcam paths on a recorded clip [Ex: ./run.sh oclbench clip.mp4]"
+    echo "  replay  : Replay saved sessions headlessly and verify their scores [Ex: ./run.sh replay sessions/ --check 40]"
     echo "  help    : Show help message [Ex: ./run.sh help]"
     echo "  version : Show version [Ex: ./run.sh version]"
 }
@@ -40,10 +45,10 @@ if [[ "$1" == "start" ]]; then
         if [[ $file_name != "" ]]; then
             if [[ $POETRY_DEP_INSTALLED == false ]]; then
                 poetry install --no-root
-                poetry run python "$file_name"
+                poetry run python "$file_name" "${@:2}"
                 config "POETRY_DEP_INSTALLED" true "$conf_path"
             else
-                poetry run python "$file_name"
+                poetry run python "$file_name" "${@:2}"
             fi
         else
             echo "Error: No such file or directory"
@@ -55,7 +60,7 @@ if [[ "$1" == "start" ]]; then
         echo "Warning: 'poetry' command is not recognized"
 
         if [[ $file_name != "" ]]; then
-            python "$file_name"
+            python "$file_name" "${@:2}"
         else
             echo "Error: No such file or directory"
             exit 1
@@ -66,6 +71,36 @@ if [[ "$1" == "start" ]]; then
         echo "Error: 'python' command is not recognized"
         exit 127
     fi
+elif [[ "$1" == "bench" ]]; then
+    if [[ is_poetry_exists -eq 0 ]]; then
+        poetry run python -m benchmarks.detection_bench "${@:2}"
+    else
+        python -m benchmarks.detection_bench "${@:2}"
+    fi
+elif [[ "$1" == "simbench" ]]; then
+    if [[ is_poetry_exists -eq 0 ]]; then
+        poetry run python -m benchmarks.simulation_bench "${@:2}"
+    else
+        python -m benchmarks.simulation_bench "${@:2}"
+    fi
+elif [[ "$1" == "batchsim" ]]; then
+    if [[ is_poetry_exists -eq 0 ]]; then
+        poetry run python -m benchmarks.batch_sim_bench "${@:2}"
+    else
+        python -m benchmarks.batch_sim_bench "${@:2}"
+    fi
+elif [[ "$1" == "oclbench" ]]; then
+    if [[ is_poetry_exists -eq 0 ]]; then
+        poetry run python -m benchmarks.opencl_bench "${@:2}"
+    else
+        python -m benchmarks.opencl_bench "${@:2}"
+    fi
+elif [[ "$1" == "replay" ]]; then
+    if [[ is_poetry_exists -eq 0 ]]; then
+        poetry run python -m benchmarks.session_replay "${@:2}"
+    else
+        python -m benchmarks.session_replay "${@:2}"
+    fi
 elif [[ "$1" == "help" ]]; then
     help
 elif [[ "$1" == "version" ]]; then